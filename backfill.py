@@ -0,0 +1,74 @@
+import argparse
+import os
+from typing import Dict, Iterable, List, Optional
+
+from main import prepare_database
+from src.batch_parser import BatchParser, VACANCY_FIELDS
+from src.db_manager import DBManager
+from src.skills import SkillExtractor
+
+
+def backfill(db_manager: DBManager, paths: Iterable[str], batch_parser: BatchParser,
+             skill_extractor: Optional[SkillExtractor] = None) -> Dict[str, int]:
+    """
+    Загрузка вакансий из сохраненных страниц ответов /vacancies.
+    Работодатели, которых еще нет в БД, добавляются по данным из вакансий (ID и название),
+    чтобы вставка вакансий не нарушала внешний ключ vacancies.employer_id.
+    Навыки из текста вакансий индексируются так же, как при загрузке с hh.ru.
+
+    :param db_manager: Менеджер БД
+    :param paths: Пути к файлам с телами ответов /vacancies
+    :param batch_parser: Парсер страниц
+    :param skill_extractor: Поиск навыков в тексте (по умолчанию - по навыкам из БД)
+    :return: Статистика: страниц, вакансий
+    """
+    if skill_extractor is None:
+        skill_extractor = SkillExtractor(db_manager.get_skill_names())
+    id_index, title_index, description_index = (
+        VACANCY_FIELDS.index(field) for field in ('id', 'title', 'description')
+    )
+
+    stats = {'pages': 0, 'vacancies': 0}
+    for records, employers in batch_parser.parse_files(paths, with_employers=True):
+        db_manager.insert_stub_employers(employers)
+        db_manager.insert_vacancies(records)
+        db_manager.add_vacancy_skills({
+            record[id_index]: skill_extractor.extract(f"{record[title_index]} {record[description_index]}")
+            for record in records
+        }, 'snippet')
+        stats['pages'] += 1
+        stats['vacancies'] += len(records)
+    return stats
+
+
+def find_files(paths: Iterable[str]) -> List[str]:
+    """
+    Раскрытие каталогов в список файлов *.json
+
+    :param paths: Пути к файлам и каталогам
+    :return: Отсортированный список файлов
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(root, name)
+                         for root, _, names in os.walk(path) for name in names if name.endswith('.json'))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Загрузка вакансий из сохраненных ответов /vacancies в БД")
+    parser.add_argument('paths', nargs='+', help="файлы с ответами API или каталоги с файлами *.json")
+    parser.add_argument('--processes', type=int, default=None, help="количество процессов (по умолчанию - число ядер)")
+    parser.add_argument('--chunksize', type=int, default=16, help="количество страниц, передаваемых процессу за раз")
+    args = parser.parse_args()
+
+    db_manager = prepare_database()
+    stats = backfill(db_manager, find_files(args.paths), BatchParser(args.processes, args.chunksize))
+    print(f"Загружено страниц: {stats['pages']}, вакансий: {stats['vacancies']}")
+
+
+if __name__ == '__main__':
+    main()
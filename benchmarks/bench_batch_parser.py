@@ -0,0 +1,66 @@
+"""
+Замер скорости BatchParser в зависимости от количества процессов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_batch_parser --pages 2000
+"""
+import argparse
+import json
+import os
+import time
+
+from src.batch_parser import BatchParser
+
+
+def make_page(page: int, per_page: int = 100) -> bytes:
+    """Генерация страницы ответа /vacancies, похожей на настоящую"""
+    items = []
+    for i in range(per_page):
+        vacancy_id = page * per_page + i
+        items.append({
+            'id': str(vacancy_id),
+            'name': f'Python разработчик {vacancy_id}',
+            'employer': {'id': str(vacancy_id % 50), 'name': 'Компания', 'url': 'https://api.hh.ru/employers/1'},
+            'salary': {'from': 100000 + i, 'to': 200000 + i, 'currency': 'RUR', 'gross': False},
+            'address': {'city': 'Москва', 'street': 'Льва Толстого', 'building': '16'},
+            'alternate_url': f'https://hh.ru/vacancy/{vacancy_id}',
+            'published_at': '2025-07-01T10:00:00+0300',
+            'snippet': {
+                'requirement': 'Опыт коммерческой разработки на <highlighttext>Python</highlighttext> от 3 лет. '
+                               'Знание PostgreSQL, Kafka, Docker.',
+                'responsibility': 'Разработка и поддержка сервисов. ' * 5
+            },
+            'area': {'id': '1', 'name': 'Москва'},
+            'schedule': {'id': 'fullDay', 'name': 'Полный день'},
+            'professional_roles': [{'id': '96', 'name': 'Программист, разработчик'}]
+        })
+    return json.dumps({'items': items, 'found': 100000, 'pages': 20, 'page': page}, ensure_ascii=False).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=2000, help='Количество страниц')
+    parser.add_argument('--max-processes', type=int, default=os.cpu_count() or 1, help='Максимум процессов')
+    args = parser.parse_args()
+
+    pages = [make_page(page) for page in range(args.pages)]
+    size_mb = sum(map(len, pages)) / 1024 / 1024
+    print(f"Страниц: {len(pages)}, объем: {size_mb:.1f} МБ, ядер: {os.cpu_count()}")
+
+    processes = 1
+    baseline = None
+    while True:
+        start = time.perf_counter()
+        records = sum(len(batch) for batch in BatchParser(processes).parse_pages(pages))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"процессов: {processes:3d}  время: {elapsed:7.2f} с  "
+              f"записей/с: {records / elapsed:10.0f}  ускорение: {baseline / elapsed:5.2f}x")
+
+        if processes >= args.max_processes:
+            break
+        processes = min(processes * 2, args.max_processes)
+
+
+if __name__ == '__main__':
+    main()
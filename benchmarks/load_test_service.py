@@ -0,0 +1,81 @@
+"""
+Нагрузочный тест HTTP-сервиса (service.py), запущенного с локальной БД.
+
+Запуск из корня проекта (сервис должен быть уже запущен):
+    python -m benchmarks.load_test_service --url http://localhost:8080 --concurrency 50 --duration 10
+"""
+import argparse
+import http.client
+import random
+import statistics
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+PATHS = [
+    '/companies',
+    '/cities',
+    '/salary/avg',
+    '/skills/top',
+    '/vacancies?city=' + quote('Москва'),
+    '/vacancies?keyword=python',
+    '/vacancies?skills=' + quote('Python,SQL'),
+]
+
+
+def worker(host: str, port: int, deadline: float, latencies: list, errors: list) -> None:
+    """Отправка запросов по одному keep-alive соединению до истечения времени"""
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    while time.perf_counter() < deadline:
+        path = random.choice(PATHS)
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8080', help='Адрес сервиса')
+    parser.add_argument('--concurrency', type=int, default=50, help='Количество одновременных клиентов')
+    parser.add_argument('--duration', type=float, default=10, help='Длительность теста в секундах')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(url.hostname, url.port or 80, deadline, latencies, errors))
+        for _ in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if not latencies:
+        print(f"Нет успешных запросов, ошибок: {len(errors)}")
+        return
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"Запросов: {len(latencies)}, ошибок: {len(errors)}, за {elapsed:.1f} с")
+    print(f"Запросов в секунду: {len(latencies) / elapsed:.0f}")
+    print(f"Задержка, мс: p50 {percentiles[49] * 1000:.1f}, p95 {percentiles[94] * 1000:.1f}, "
+          f"p99 {percentiles[98] * 1000:.1f}, max {max(latencies) * 1000:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,3 +10,26 @@ DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'password')
 DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = os.getenv('DB_PORT', '5432')
+
+# Срок актуальности сопоставления названий компаний с работодателями HH (в днях)
+EMPLOYER_CACHE_TTL_DAYS = int(os.getenv('EMPLOYER_CACHE_TTL_DAYS', '7'))
+
+# Параметры загрузки подробной информации о вакансиях
+VACANCY_DETAILS_TTL_DAYS = int(os.getenv('VACANCY_DETAILS_TTL_DAYS', '1'))
+VACANCY_DETAILS_WORKERS = int(os.getenv('VACANCY_DETAILS_WORKERS', '8'))
+
+# Кэш результатов запросов: максимальный размер в мегабайтах (0 - без кэша) и каталог пользователя,
+# в котором кэш и отметка о готовности БД сохраняются между запусками (пустое значение - не сохранять)
+QUERY_CACHE_MAX_MB = int(os.getenv('QUERY_CACHE_MAX_MB', '32'))
+QUERY_CACHE_DIR = os.getenv(
+    'QUERY_CACHE_DIR',
+    os.path.join(os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'hh_vacancies')
+) or None
+
+# Параметры HTTP-сервиса для чтения данных
+SERVICE_HOST = os.getenv('SERVICE_HOST', 'localhost')
+SERVICE_PORT = int(os.getenv('SERVICE_PORT', '8080'))
+SERVICE_POOL_SIZE = int(os.getenv('SERVICE_POOL_SIZE', '8'))
+
+# Количество параллельных запросов при загрузке вакансий компании
+CRAWL_WORKERS = int(os.getenv('CRAWL_WORKERS', '8'))
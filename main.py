@@ -1,43 +1,135 @@
-from config import DB_NAME, DB_USER, DB_PASSWORD
-from src.db_creator import DBCreator
-from src.db_manager import DBManager
-from src.hh_api import HeadHunterAPI
+import argparse
+import hashlib
+import os
+from typing import Optional
 
+from psycopg2 import OperationalError
 
-def main():
-    # Список интересующих компаний
-    companies = [
-        'Яндекс',
-        'Тинькофф',
-        'Сбер',
-        'ВКонтакте',
-        'Ростелеком',
-        'Лаборатория Касперского',
-        '1С',
-        'МТС',
-        'Газпром нефть',
-        'Ozon'
-    ]
-
-    # Создаем базу данных и таблицы
-    db_creator = DBCreator(DB_USER, DB_PASSWORD)
+from config import (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, EMPLOYER_CACHE_TTL_DAYS,
+                    VACANCY_DETAILS_TTL_DAYS, VACANCY_DETAILS_WORKERS,
+                    QUERY_CACHE_MAX_MB, QUERY_CACHE_DIR, CRAWL_WORKERS)
+from src.db_creator import DBCreator, SCHEMA_VERSION
+from src.db_manager import DBManager
+
+# Список интересующих компаний
+COMPANIES = [
+    'Яндекс',
+    'Тинькофф',
+    'Сбер',
+    'ВКонтакте',
+    'Ростелеком',
+    'Лаборатория Касперского',
+    '1С',
+    'МТС',
+    'Газпром нефть',
+    'Ozon'
+]
+
+
+def prepare_database() -> DBManager:
+    """
+    Подготовка БД. База и таблицы создаются, только если версия схемы отсутствует или устарела.
+    Успешная проверка запоминается в каталоге QUERY_CACHE_DIR, чтобы не повторять ее при каждом запуске.
+
+    :return: Менеджер БД
+    """
+    ready_mark = f"{DB_HOST}:{DB_PORT}/{DB_NAME}:{SCHEMA_VERSION}"
+    try:
+        db_manager = _create_db_manager()
+    except OperationalError:
+        # База данных еще не создана
+        db_manager = None
+
+    if db_manager and (_read_ready_mark() == ready_mark or db_manager.get_schema_version() == SCHEMA_VERSION):
+        _write_ready_mark(ready_mark)
+        return db_manager
+
+    db_creator = DBCreator(DB_USER, DB_PASSWORD, DB_HOST, DB_PORT)
     db_creator.create_database(DB_NAME)
     db_creator.create_tables(DB_NAME)
 
+    _write_ready_mark(ready_mark)
+    return db_manager or _create_db_manager()
+
+
+def _create_db_manager() -> DBManager:
+    """Создание менеджера БД с кэшем результатов запросов"""
+    return DBManager(DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT,
+                     cache_max_bytes=QUERY_CACHE_MAX_MB * 1024 * 1024, cache_path=_query_cache_path())
+
+
+def _query_cache_path() -> Optional[str]:
+    """Файл кэша результатов запросов"""
+    return _cache_file('query_cache', 'pickle')
+
+
+def _ready_mark_path() -> Optional[str]:
+    """Файл с результатом последней проверки готовности БД"""
+    return _cache_file('ready', 'txt')
+
+
+def _cache_file(prefix: str, extension: str) -> Optional[str]:
+    """Файл в каталоге пользователя QUERY_CACHE_DIR: у каждой БД (хост, порт, имя) свой файл"""
+    if not QUERY_CACHE_DIR:
+        return None
+    db_identity = hashlib.md5(f"{DB_HOST}:{DB_PORT}/{DB_NAME}".encode('utf-8')).hexdigest()
+    return os.path.join(QUERY_CACHE_DIR, f"{prefix}_{db_identity}.{extension}")
+
+
+def _read_ready_mark() -> str:
+    """Чтение результата последней проверки готовности БД"""
+    path = _ready_mark_path()
+    if not path or not os.path.exists(path):
+        return ''
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+
+def _write_ready_mark(ready_mark: str) -> None:
+    """Сохранение результата проверки готовности БД"""
+    path = _ready_mark_path()
+    if path and _read_ready_mark() != ready_mark:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(ready_mark)
+
+
+def load_data(db_manager: DBManager) -> None:
+    """
+    Загрузка компаний и вакансий с hh.ru в БД
+
+    :param db_manager: Менеджер БД
+    """
+    # HTTP-клиент и модули загрузки нужны только здесь, поэтому импортируются лениво
+    from src.batch_parser import VACANCY_FIELDS
+    from src.crawl_planner import CrawlPlanner
+    from src.employer_resolver import EmployerResolver
+    from src.hh_api import HeadHunterAPI
+    from src.skills import SkillExtractor
+    from src.vacancy_enricher import VacancyEnricher
+
     # Получаем данные от API
     hh_api = HeadHunterAPI()
     hh_api.connect()
 
-    # Получаем информацию о компаниях
-    employers = hh_api.get_employers(companies)
+    # Получаем информацию о компаниях (из БД или от API) и заполняем таблицу employers
+    resolver = EmployerResolver(hh_api, db_manager, EMPLOYER_CACHE_TTL_DAYS)
+    employers = resolver.resolve(COMPANIES)
     print(f"Получено {len(employers)} компаний")
 
-    # Создаем менеджер БД
-    db_manager = DBManager(DB_NAME, DB_USER, DB_PASSWORD)
-
-    # Заполняем таблицу employers
-    for employer in employers:
-        db_manager.insert_employer(employer)
+    # Сообщаем о неоднозначных сопоставлениях и предлагаем закрепить нужную компанию
+    for result in resolver.ambiguous:
+        print(f"\nДля '{result['query']}' найдено несколько компаний, выбрана '{result['employer']['name']}':")
+        for i, candidate in enumerate(result['candidates'], 1):
+            print(f"{i}. {candidate['name']} ({candidate['url']})")
+        choice = input("Номер компании для закрепления (Enter - оставить как есть): ")
+        if choice.isdigit() and 1 <= int(choice) <= len(result['candidates']):
+            candidate = result['candidates'][int(choice) - 1]
+            db_manager.insert_employer(candidate)
+            db_manager.pin_employer(result['query'], candidate['id'])
+            employers = [candidate if e['id'] == result['employer']['id'] else e for e in employers]
+            # Закрепленная компания могла уже быть в списке под другим названием
+            employers = list({employer['id']: employer for employer in employers}.values())
 
     # Запрашиваем у пользователя город для фильтрации
     city_filter = input("Хотите фильтровать вакансии по городу? (y/n): ").lower()
@@ -57,15 +149,40 @@ def main():
                 choice = int(input("> ")) - 1
                 city_id = areas[choice]['id']
 
-    # Получаем и сохраняем вакансии для каждой компании
+    # Получаем и сохраняем вакансии для каждой компании, индексируя навыки из текста вакансий
+    # Запросы, по которым найдено больше 2000 вакансий, делятся по регионам и датам публикации
+    skill_extractor = SkillExtractor(db_manager.get_skill_names())
+    planner = CrawlPlanner(hh_api, CRAWL_WORKERS)
     for employer in employers:
-        vacancies = hh_api.get_vacancies(employer['id'], city_id)
+        vacancies = planner.crawl(employer['id'], city_id)
         print(f"Получено {len(vacancies)} вакансий для компании {employer['name']}")
+        if planner.truncated:
+            print(f"Не удалось загрузить все вакансии компании {employer['name']}: "
+                  f"{len(planner.truncated)} запросов превышают ограничение поиска")
+        if planner.failed:
+            print(f"Не удалось загрузить все вакансии компании {employer['name']}: "
+                  f"{len(planner.failed)} запросов завершились ошибкой, повторите загрузку позже")
+
+        db_manager.insert_vacancies([tuple(vacancy[field] for field in VACANCY_FIELDS) for vacancy in vacancies])
+
+        db_manager.add_vacancy_skills({
+            vacancy['id']: skill_extractor.extract(f"{vacancy['title']} {vacancy['description']}")
+            for vacancy in vacancies
+        }, 'snippet')
+
+    # Загружаем подробную информацию о новых и устаревших вакансиях
+    enricher = VacancyEnricher(hh_api, db_manager, VACANCY_DETAILS_TTL_DAYS, VACANCY_DETAILS_WORKERS)
+    stats = enricher.run()
+    print(f"Подробная информация: обновлено {stats['updated']}, без изменений {stats['unchanged']}, "
+          f"снято с публикации {stats['removed']}, ошибок {stats['failed']}")
+
 
-        for vacancy in vacancies:
-            db_manager.insert_vacancy(vacancy)
+def run_menu(db_manager: DBManager) -> None:
+    """
+    Взаимодействие с пользователем
 
-    # Взаимодействие с пользователем
+    :param db_manager: Менеджер БД
+    """
     while True:
         print("\nВыберите действие:")
         print("1. Получить список всех компаний и количество вакансий")
@@ -75,6 +192,8 @@ def main():
         print("5. Поиск вакансий по ключевому слову")
         print("6. Получить список вакансий по городу")
         print("7. Получить список городов с количеством вакансий")
+        print("8. Получить самые востребованные навыки")
+        print("9. Поиск вакансий по навыкам")
         print("0. Выход")
 
         choice = input("> ")
@@ -152,6 +271,40 @@ def main():
             else:
                 print("Информация о городах отсутствует")
 
+        elif choice == '8':
+            company = input("Название компании (Enter - все компании): ").strip().casefold()
+            city = input("Город (Enter - все города): ").strip()
+            employer_id = next((e['id'] for e in db_manager.get_employers() if e['name'].casefold() == company), None)
+            if company and employer_id is None:
+                print(f"Компания {company} не найдена среди загруженных")
+                continue
+
+            skills = db_manager.get_top_skills(employer_id, city or None)
+            if skills:
+                print("\nСамые востребованные навыки:")
+                for skill in skills:
+                    salary = f"{skill['avg_salary_from'] or 0:.0f}-{skill['avg_salary_to'] or 0:.0f}"
+                    print(f"{skill['skill']}: {skill['vacancies_count']} вакансий, средняя зарплата {salary}")
+            else:
+                print("Информация о навыках отсутствует")
+
+        elif choice == '9':
+            skills = [skill for skill in input("Введите навыки через запятую: ").split(',') if skill.strip()]
+            vacancies = db_manager.get_vacancies_with_skills(skills)
+
+            if vacancies:
+                print(f"\nНайдено {len(vacancies)} вакансий с навыками {', '.join(skills)}:")
+
+                for vacancy in vacancies:
+                    salary = (f"Зарплата: {vacancy['salary_from'] or '?'}-{vacancy['salary_to'] or '?'} "
+                              f"{vacancy['currency'] or ''}")
+                    print(f"\n{vacancy['company']}: {vacancy['title']}")
+                    print(f"{salary}")
+                    print(f"Ссылка: {vacancy['url']}")
+
+            else:
+                print("\nВакансий с такими навыками не найдено.")
+
         elif choice == '0':
             break
 
@@ -159,5 +312,23 @@ def main():
             print("Неверный ввод. Попробуйте еще раз.")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Парсер вакансий с HeadHunter")
+    parser.add_argument('-q', '--query', action='store_true',
+                        help="работать с уже сохраненными данными, без загрузки с hh.ru")
+    args = parser.parse_args()
+
+    db_manager = prepare_database()
+    if not args.query:
+        load_data(db_manager)
+    run_menu(db_manager)
+
+    db_manager.save_cache()
+    stats = db_manager.get_cache_stats()
+    if stats:
+        print(f"Кэш запросов: попаданий {stats['hits']} из {stats['hits'] + stats['misses']} "
+              f"({stats['hit_rate']:.0%}), записей {stats['entries']}")
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,35 @@
+import argparse
+
+from config import (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, QUERY_CACHE_MAX_MB,
+                    SERVICE_HOST, SERVICE_PORT, SERVICE_POOL_SIZE)
+from src.db_manager import DBManager
+from src.query_service import DBManagerPool, QueryService, create_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP-сервис для чтения данных о вакансиях")
+    parser.add_argument('--host', default=SERVICE_HOST, help="хост")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="порт")
+    parser.add_argument('--pool-size', type=int, default=SERVICE_POOL_SIZE, help="количество соединений с БД")
+    args = parser.parse_args()
+
+    # Кэшируются готовые ответы сервиса, поэтому кэш результатов в самих DBManager не нужен,
+    # а поколение данных сервис проверяет сам с собственным интервалом
+    pool = DBManagerPool(
+        args.pool_size,
+        lambda: DBManager(DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, cache_max_bytes=0,
+                          generation_check_interval=0)
+    )
+    service = QueryService(pool, QUERY_CACHE_MAX_MB * 1024 * 1024)
+    server = create_server(service, args.host, args.port)
+    print(f"Сервис запущен на http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
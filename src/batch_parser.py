@@ -0,0 +1,114 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Iterable, Iterator, Optional, Tuple, Any, Dict
+
+from src.hh_api import HeadHunterAPI
+
+# Порядок полей в записях, которые возвращает BatchParser
+VACANCY_FIELDS = (
+    'id', 'employer_id', 'title', 'salary_from', 'salary_to',
+    'currency', 'url', 'description', 'city', 'published_at'
+)
+
+
+def parse_page(raw: bytes) -> List[Tuple[Any, ...]]:
+    """
+    Парсинг одной страницы ответа /vacancies в компактные записи
+
+    :param raw: Тело ответа API в виде байтов
+    :return: Список кортежей с полями в порядке VACANCY_FIELDS
+    """
+    return parse_page_with_employers(raw)[0]
+
+
+def parse_page_with_employers(raw: bytes) -> Tuple[List[Tuple[Any, ...]], List[Dict[str, Any]]]:
+    """
+    Парсинг одной страницы ответа /vacancies вместе с работодателями вакансий
+
+    :param raw: Тело ответа API в виде байтов
+    :return: Кортеж (список записей в порядке VACANCY_FIELDS, список работодателей без повторов)
+    """
+    data = json.loads(raw)
+    items = data.get('items', []) if isinstance(data, dict) else data
+    records = []
+    employers = {}
+    for item in items:
+        vacancy = HeadHunterAPI._parse_vacancy(item)
+        records.append(tuple(vacancy[field] for field in VACANCY_FIELDS))
+        employer = item.get('employer') or {}
+        # У анонимных работодателей нет ID, их вакансии сохраняются без employer_id
+        if employer.get('id'):
+            employers[employer['id']] = {
+                'id': employer['id'],
+                'name': employer.get('name') or '',
+                'url': employer.get('alternate_url'),
+                'open_vacancies': None
+            }
+    return records, list(employers.values())
+
+
+def _parse_chunk(pages: List[bytes], with_employers: bool) -> List[Any]:
+    """Парсинг пачки страниц в дочернем процессе"""
+    parse = parse_page_with_employers if with_employers else parse_page
+    return [parse(page) for page in pages]
+
+
+class BatchParser:
+    """Класс для параллельного парсинга большого количества сохраненных страниц с вакансиями"""
+
+    def __init__(self, processes: Optional[int] = None, chunksize: int = 16):
+        """
+        Инициализация парсера
+
+        :param processes: Количество процессов (по умолчанию - число ядер, 1 - без пула процессов)
+        :param chunksize: Количество страниц, передаваемых процессу за один раз
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunksize = chunksize
+
+    def parse_pages(self, pages: Iterable[bytes], with_employers: bool = False) -> Iterator[Any]:
+        """
+        Парсинг страниц в пуле процессов. Страницы передаются в процессы как байты,
+        без предварительного декодирования JSON. Страницы читаются из pages по мере обработки:
+        в работе одновременно не больше processes * chunksize * 2 страниц.
+
+        :param pages: Тела ответов /vacancies в виде байтов
+        :param with_employers: Возвращать ли вместе с записями работодателей (см. parse_page_with_employers)
+        :return: Итератор по спискам записей (по одному на страницу, в исходном порядке)
+        """
+        if self.processes == 1:
+            yield from map(parse_page_with_employers if with_employers else parse_page, pages)
+            return
+
+        pages = iter(pages)
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            in_flight = deque()
+            while True:
+                while len(in_flight) < self.processes * 2:
+                    chunk = list(islice(pages, self.chunksize))
+                    if not chunk:
+                        break
+                    in_flight.append(executor.submit(_parse_chunk, chunk, with_employers))
+                if not in_flight:
+                    return
+                yield from in_flight.popleft().result()
+
+    def parse_files(self, paths: Iterable[str], with_employers: bool = False) -> Iterator[Any]:
+        """
+        Парсинг страниц, сохраненных в файлах
+
+        :param paths: Пути к файлам с телами ответов /vacancies
+        :param with_employers: Возвращать ли вместе с записями работодателей
+        :return: Итератор по спискам записей (по одному на файл)
+        """
+        return self.parse_pages(self._read_files(paths), with_employers)
+
+    @staticmethod
+    def _read_files(paths: Iterable[str]) -> Iterator[bytes]:
+        """Чтение файлов в виде байтов"""
+        for path in paths:
+            with open(path, 'rb') as file:
+                yield file.read()
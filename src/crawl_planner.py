@@ -0,0 +1,222 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
+
+from src.hh_api import HeadHunterAPI
+
+# Поиск HH отдает не больше 2000 вакансий на один запрос, сколько бы страниц ни запрашивалось
+SEARCH_LIMIT = 2000
+
+# Формат date_from/date_to, который ожидает API HH (смещение часового пояса без двоеточия)
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+
+class CrawlPlanner:
+    """Класс для полной загрузки вакансий работодателя в обход ограничения поиска в 2000 результатов.
+    Запрос, по которому найдено больше вакансий, делится по регионам, а затем по периодам публикации.
+    Соседние регионы, которые укладываются в ограничение вместе, объединяются в один запрос (area повторяется).
+    Подзапросы и страницы, которые не удалось загрузить, не прерывают обход, а собираются в failed."""
+
+    def __init__(self, hh_api: HeadHunterAPI, max_workers: int = 8, limit: int = SEARCH_LIMIT,
+                 per_page: int = 100, window: timedelta = timedelta(days=30),
+                 min_window: timedelta = timedelta(minutes=10), drift_tolerance: float = 0.001):
+        """
+        Инициализация планировщика
+
+        :param hh_api: Клиент API HeadHunter
+        :param max_workers: Количество параллельных запросов к API
+        :param limit: Максимальное количество вакансий, доступное по одному запросу
+        :param per_page: Количество вакансий на странице
+        :param window: Период, который отделяется от начала интервала без нижней границы даты
+        :param min_window: Минимальный период публикации, который еще делится пополам
+        :param drift_tolerance: Доля вакансий региона, на которую сумма по вложенным регионам может отличаться
+            от повторного подсчета из-за публикации и снятия вакансий во время обхода
+        """
+        self.hh_api = hh_api
+        self.max_workers = max_workers
+        self.limit = limit
+        self.per_page = per_page
+        self.window = window
+        self.min_window = min_window
+        self.drift_tolerance = drift_tolerance
+        self.truncated = []
+        self.failed = []
+        self._areas = None
+
+    def plan(self, employer_id: str, area_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Построение набора подзапросов, каждый из которых укладывается в ограничение поиска,
+        а вместе они покрывают все вакансии работодателя
+
+        :param employer_id: ID работодателя
+        :param area_id: ID региона (опционально)
+        :return: Список подзапросов: словари с параметрами поиска (params) и количеством вакансий (found)
+        """
+        params = {'employer_id': employer_id}
+        if area_id:
+            params['area'] = area_id
+
+        self.truncated = []
+        self.failed = []
+        root = {'params': params, 'found': self._count(params), 'split_by_area': True}
+        leaves = []
+        pending = [root]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending:
+                splits = []
+                for node in pending:
+                    if not node['found']:
+                        # Вакансий нет или подсчитать их не удалось (запрос уже в failed)
+                        continue
+                    if node['found'] <= self.limit:
+                        leaves.append(node)
+                        continue
+                    children = self._split(node)
+                    if children:
+                        splits.append((node, children))
+                    else:
+                        # Делить дальше некуда: будут загружены только первые limit вакансий
+                        self.truncated.append(node)
+                        leaves.append(node)
+
+                queries = [child['params'] for _, children in splits for child in children]
+                counts = iter(list(executor.map(self._count, queries)))
+                pending = []
+                for node, children in splits:
+                    for child in children:
+                        child['found'] = next(counts)
+                    if not node['split_by_area']:
+                        pending.extend(children)
+                    elif self._has_own_vacancies(node, children):
+                        # Часть вакансий привязана к самому региону, а не к вложенным - делим его по датам
+                        pending.append({**node, 'split_by_area': False})
+                    else:
+                        # Регионы больше ограничения делятся дальше, остальные объединяются в общие запросы
+                        pending.extend(child for child in children if child['found'] and child['found'] > self.limit)
+                        leaves.extend(self._group_areas(
+                            node, [child for child in children if child['found'] and child['found'] <= self.limit]
+                        ))
+
+        return [{'params': leaf['params'], 'found': leaf['found']} for leaf in leaves]
+
+    def crawl(self, employer_id: str, area_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Загрузка всех вакансий работодателя по плану подзапросов (страницы загружаются параллельно)
+
+        :param employer_id: ID работодателя
+        :param area_id: ID региона (опционально)
+        :return: Список вакансий без повторов
+        """
+        tasks = []
+        for query in self.plan(employer_id, area_id):
+            pages = math.ceil(min(query['found'], self.limit) / self.per_page)
+            tasks.extend((query['params'], page) for page in range(pages))
+
+        vacancies = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for items in executor.map(lambda task: self._fetch_page(*task), tasks):
+                for vacancy in items:
+                    vacancies.setdefault(vacancy['id'], vacancy)
+        return list(vacancies.values())
+
+    def _group_areas(self, node: Dict[str, Any], children: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Объединение соседних регионов в запросы с несколькими area, каждый из которых укладывается
+        в ограничение (с запасом drift_tolerance на вакансии, опубликованные во время обхода)
+        """
+        capacity = self.limit - math.ceil(self.limit * self.drift_tolerance)
+        groups = []
+        # Первый подходящий запрос для регионов по убыванию количества вакансий
+        for child in sorted(children, key=lambda child: child['found'], reverse=True):
+            for group in groups:
+                if group['found'] + child['found'] <= capacity:
+                    group['areas'].append(child['params']['area'])
+                    group['found'] += child['found']
+                    break
+            else:
+                groups.append({'areas': [child['params']['area']], 'found': child['found']})
+
+        return [{
+            'params': {**node['params'], 'area': group['areas'] if len(group['areas']) > 1 else group['areas'][0]},
+            'found': group['found'],
+            'split_by_area': True
+        } for group in groups]
+
+    def _has_own_vacancies(self, node: Dict[str, Any], children: List[Dict[str, Any]]) -> bool:
+        """
+        Проверка, есть ли у региона вакансии, не привязанные ни к одному вложенному региону.
+        Если сумма по вложенным регионам меньше, регион подсчитывается заново: за время обхода
+        часть вакансий могла быть снята с публикации.
+        """
+        if any(child['found'] is None for child in children):
+            # Подсчет части вложенных регионов не удался - сравнивать не с чем, остальные загружаются как есть
+            return False
+        total = sum(child['found'] for child in children)
+        if total >= node['found']:
+            return False
+        found = self._count(node['params'])
+        if found is None:
+            return False
+        return found - total > found * self.drift_tolerance
+
+    def _count(self, params: Dict[str, Any]) -> Optional[int]:
+        """Количество вакансий, найденных по запросу (None, если запрос не удался)"""
+        try:
+            return self.hh_api.search_vacancies(params, per_page=1)['found']
+        except ConnectionError as e:
+            self.failed.append({'params': params, 'page': None, 'error': str(e)})
+            return None
+
+    def _fetch_page(self, params: Dict[str, Any], page: int) -> List[Dict[str, Any]]:
+        """Загрузка одной страницы вакансий по запросу (при ошибке страница попадает в failed)"""
+        try:
+            return self.hh_api.search_vacancies(params, page, self.per_page)['items']
+        except ConnectionError as e:
+            self.failed.append({'params': params, 'page': page, 'error': str(e)})
+            return []
+
+    def _split(self, node: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Разбиение запроса на подзапросы: сначала по вложенным регионам, затем по периоду публикации"""
+        params = node['params']
+        if node['split_by_area']:
+            children = self._child_areas(params.get('area'))
+            if children:
+                return [{'params': {**params, 'area': area['id']}, 'split_by_area': True} for area in children]
+
+        if 'date_to' in params:
+            date_to = datetime.strptime(params['date_to'], DATE_FORMAT)
+        else:
+            date_to = datetime.now(timezone.utc).replace(microsecond=0)
+        if 'date_from' in params:
+            date_from = datetime.strptime(params['date_from'], DATE_FORMAT)
+            if date_to - date_from < self.min_window:
+                return []
+            middle = date_from + (date_to - date_from) / 2
+            windows = [(date_from, middle), (middle, date_to)]
+        else:
+            middle = date_to - self.window
+            windows = [(None, middle), (middle, date_to)]
+
+        children = []
+        for window_from, window_to in windows:
+            child = {**params, 'date_to': window_to.strftime(DATE_FORMAT)}
+            if window_from:
+                child['date_from'] = window_from.strftime(DATE_FORMAT)
+            children.append({'params': child, 'split_by_area': False})
+        return children
+
+    def _child_areas(self, area_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Вложенные регионы (для запроса без региона - регионы верхнего уровня)"""
+        if self._areas is None:
+            self._areas = {}
+            stack = list(self.hh_api.get_areas_tree())
+            while stack:
+                area = stack.pop()
+                self._areas[area['id']] = area
+                stack.extend(area.get('areas') or [])
+
+        if area_id is None:
+            return self.hh_api.get_areas_tree()
+        area = self._areas.get(str(area_id))
+        return (area.get('areas') or []) if area else []
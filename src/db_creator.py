@@ -2,6 +2,9 @@ import psycopg2
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
+# Версия схемы БД, увеличивается при каждом изменении create_tables
+SCHEMA_VERSION = 6
+
 
 class DBCreator:
     """Класс для создания базы данных и таблиц"""
@@ -94,6 +97,77 @@ class DBCreator:
                     )
                 """)
 
+                # Колонки с подробной информацией о вакансиях (добавляются и в ранее созданную таблицу)
+                cur.execute("""
+                    ALTER TABLE vacancies
+                        ADD COLUMN IF NOT EXISTS published_at TIMESTAMPTZ,
+                        ADD COLUMN IF NOT EXISTS key_skills TEXT[],
+                        ADD COLUMN IF NOT EXISTS experience VARCHAR(50),
+                        ADD COLUMN IF NOT EXISTS employment VARCHAR(50),
+                        ADD COLUMN IF NOT EXISTS detail_hash VARCHAR(32),
+                        ADD COLUMN IF NOT EXISTS detail_fetched_at TIMESTAMPTZ,
+                        ADD COLUMN IF NOT EXISTS detail_removed_at TIMESTAMPTZ
+                """)
+                # В ранних версиях схемы detail_fetched_at создавалась как TIMESTAMP без часового пояса
+                cur.execute("ALTER TABLE vacancies ALTER COLUMN detail_fetched_at TYPE TIMESTAMPTZ")
+
+                # Создаем справочник навыков и связь навыков с вакансиями
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS skills (
+                        id SERIAL PRIMARY KEY,
+                        name VARCHAR(100) NOT NULL UNIQUE,
+                        title VARCHAR(100) NOT NULL
+                    )
+                """)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS vacancy_skills (
+                        skill_id INTEGER REFERENCES skills(id),
+                        vacancy_id VARCHAR(20) REFERENCES vacancies(id) ON DELETE CASCADE,
+                        source VARCHAR(20) NOT NULL,
+                        PRIMARY KEY (skill_id, vacancy_id)
+                    )
+                """)
+
+                # Индексы для выборок по навыкам, компаниям и городам
+                cur.execute("CREATE INDEX IF NOT EXISTS vacancy_skills_vacancy_id_idx ON vacancy_skills (vacancy_id)")
+                cur.execute("CREATE INDEX IF NOT EXISTS vacancies_employer_id_idx ON vacancies (employer_id)")
+                # Город сравнивается без учета регистра (см. DBManager.get_top_skills)
+                cur.execute("DROP INDEX IF EXISTS vacancies_city_idx")
+                cur.execute("CREATE INDEX IF NOT EXISTS vacancies_city_lower_idx ON vacancies (lower(city))")
+
+                # Создаем таблицу сопоставления названий компаний с работодателями HH
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS employer_resolutions (
+                        query VARCHAR(100) PRIMARY KEY,
+                        employer_id VARCHAR(20),
+                        ambiguous BOOLEAN NOT NULL DEFAULT FALSE,
+                        candidates JSONB,
+                        pinned BOOLEAN NOT NULL DEFAULT FALSE,
+                        resolved_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                    )
+                """)
+                # В ранних версиях схемы resolved_at создавалась как TIMESTAMP без часового пояса
+                cur.execute("ALTER TABLE employer_resolutions ALTER COLUMN resolved_at TYPE TIMESTAMPTZ")
+
+                # Создаем счетчик изменений данных, по которому сбрасывается кэш результатов запросов
+                # epoch - случайное значение, которое задается при создании счетчика: после пересоздания БД
+                # счетчик снова начинается с 0, но закэшированные результаты старой БД не подходят по epoch
+                cur.execute("CREATE TABLE IF NOT EXISTS cache_generation (generation BIGINT NOT NULL)")
+                cur.execute("""
+                    ALTER TABLE cache_generation
+                        ADD COLUMN IF NOT EXISTS epoch TEXT NOT NULL
+                            DEFAULT md5(random()::text || clock_timestamp()::text)
+                """)
+                cur.execute("""
+                    INSERT INTO cache_generation (generation)
+                    SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM cache_generation)
+                """)
+
+                # Сохраняем версию схемы, чтобы при следующих запусках не выполнять DDL
+                cur.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)")
+                cur.execute("DELETE FROM schema_version")
+                cur.execute("INSERT INTO schema_version (version) VALUES (%s)", (SCHEMA_VERSION,))
+
                 print("Таблицы успешно созданы")
 
             self.conn.commit()
@@ -1,14 +1,21 @@
-from typing import List, Dict, Any
+import time
+import uuid
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, Json, execute_values
+
+from src.query_cache import QueryCache, cached_query
+from src.skills import SkillExtractor
 
 
 class DBManager:
     """Класс для управления базой данных PostgreSQL"""
 
-    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: str = '5432'):
+    def __init__(self, dbname: str, user: str, password: str, host: str = 'localhost', port: str = '5432',
+                 cache_max_bytes: int = 32 * 1024 * 1024, cache_path: Optional[str] = None,
+                 generation_check_interval: float = 1.0):
         """
         Инициализация менеджера БД
 
@@ -17,6 +24,9 @@ class DBManager:
         :param password: Пароль
         :param host: Хост
         :param port: Порт
+        :param cache_max_bytes: Размер кэша результатов запросов в байтах (0 - без кэша)
+        :param cache_path: Файл для сохранения кэша между запусками (опционально)
+        :param generation_check_interval: Как часто (в секундах) проверять, не изменились ли данные в БД
         """
         self.conn = psycopg2.connect(
             dbname=dbname,
@@ -26,12 +36,118 @@ class DBManager:
             port=port
         )
         self.conn.autocommit = True
+        self.cache = QueryCache(cache_max_bytes, cache_path) if cache_max_bytes else None
+        self.generation_check_interval = generation_check_interval
+        self._generation = None
+        self._generation_checked_at = 0.0
 
     def __del__(self):
         """Закрытие соединения при удалении объекта"""
         if hasattr(self, 'conn') and self.conn:
             self.conn.close()
 
+    def get_generation(self) -> Tuple[Optional[str], int]:
+        """
+        Получает поколение данных: случайный epoch, заданный при создании БД, и номер,
+        который увеличивается при каждой записи в БД. Значение запрашивается из БД
+        не чаще, чем раз в generation_check_interval секунд.
+
+        :return: Кортеж (epoch, номер поколения данных)
+        """
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked_at >= self.generation_check_interval:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT epoch, generation FROM cache_generation")
+                row = cur.fetchone()
+            self._generation = tuple(row) if row else (None, 0)
+            self._generation_checked_at = now
+        return self._generation
+
+    def _bump_generation(self) -> None:
+        """Увеличение номера поколения данных, делающее устаревшими все закэшированные результаты"""
+        with self.conn.cursor() as cur:
+            cur.execute("UPDATE cache_generation SET generation = generation + 1 RETURNING epoch, generation")
+            row = cur.fetchone()
+        self._generation = tuple(row) if row else None
+        self._generation_checked_at = time.monotonic()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Получает статистику кэша результатов запросов
+
+        :return: Словарь со статистикой (см. QueryCache.stats)
+        """
+        return self.cache.stats() if self.cache else {}
+
+    def save_cache(self) -> None:
+        """Сохраняет кэш результатов запросов в файл, если он задан"""
+        if self.cache:
+            self.cache.save()
+
+    def get_schema_version(self) -> Optional[int]:
+        """
+        Получает версию схемы БД
+
+        :return: Номер версии или None, если таблицы еще не созданы
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                return None
+            cur.execute("SELECT MAX(version) FROM schema_version")
+            return cur.fetchone()[0]
+
+    def iter_rows(self, method_name: str, *args: Any, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Построчная выдача результата запроса через курсор на стороне сервера, без загрузки
+        всего результата в память. Поддерживаются методы, у которых есть построитель запроса
+        _<метод>_sql (выборки вакансий). Результаты не кэшируются.
+
+        :param method_name: Имя метода DBManager, например get_all_vacancies
+        :param args: Параметры метода
+        :param batch_size: Количество строк, получаемых из БД за один раз
+        :return: Итератор по пачкам строк
+        """
+        statement = getattr(self, f"_{method_name}_sql")(*args)
+        if statement is None:
+            return
+
+        # Курсор на стороне сервера существует только внутри транзакции
+        autocommit = self.conn.autocommit
+        self.conn.autocommit = False
+        try:
+            with self.conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cur:
+                cur.itersize = batch_size
+                cur.execute(*statement)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+        finally:
+            if not self.conn.closed:
+                self.conn.rollback()
+                self.conn.autocommit = autocommit
+
+    def _fetch_all(self, statement: Optional[Tuple[Any, Any]]) -> List[Dict[str, Any]]:
+        """Выполнение запроса, построенного методом _<метод>_sql, с получением всех строк"""
+        if statement is None:
+            return []
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(*statement)
+            return cur.fetchall()
+
+    def get_employers(self) -> List[Dict[str, Any]]:
+        """
+        Получает список всех сохраненных работодателей
+
+        :return: Список словарей с информацией о компаниях
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT id, name, url, open_vacancies FROM employers ORDER BY name")
+            return cur.fetchall()
+
+    @cached_query
     def get_companies_and_vacancies_count(self) -> List[Dict[str, Any]]:
         """
         Получает список всех компаний и количество вакансий у каждой компании
@@ -49,6 +165,7 @@ class DBManager:
             cur.execute(query)
             return cur.fetchall()
 
+    @cached_query
     def get_all_vacancies(self) -> List[Dict[str, Any]]:
         """
         Получает список всех вакансий с указанием названия компании,
@@ -56,17 +173,21 @@ class DBManager:
 
         :return: Список словарей с информацией о вакансиях
         """
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = """
-                SELECT e.name as company, v.title, 
-                       v.salary_from, v.salary_to, v.currency, v.url
-                FROM vacancies v
-                JOIN employers e ON v.employer_id = e.id
-                ORDER BY e.name, v.salary_from DESC NULLS LAST
-            """
-            cur.execute(query)
-            return cur.fetchall()
+        return self._fetch_all(self._get_all_vacancies_sql())
+
+    @staticmethod
+    def _get_all_vacancies_sql() -> Tuple[Any, Any]:
+        """Запрос и параметры для get_all_vacancies"""
+        query = """
+            SELECT e.name as company, v.title, 
+                   v.salary_from, v.salary_to, v.currency, v.url
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            ORDER BY e.name, v.salary_from DESC NULLS LAST
+        """
+        return query, ()
 
+    @cached_query
     def get_avg_salary(self) -> Dict[str, Any]:
         """
         Получает среднюю зарплату по вакансиям
@@ -84,32 +205,37 @@ class DBManager:
             cur.execute(query)
             return cur.fetchone()
 
+    @cached_query
     def get_vacancies_with_higher_salary(self) -> List[Dict[str, Any]]:
         """
         Получает список всех вакансий, у которых зарплата выше средней по всем вакансиям
 
         :return: Список словарей с информацией о вакансиях
         """
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = """
-                SELECT e.name as company, v.title, 
-                       v.salary_from, v.salary_to, v.currency, v.url
-                FROM vacancies v
-                JOIN employers e ON v.employer_id = e.id
-                WHERE v.salary_from > (
-                    SELECT AVG(salary_from) 
-                    FROM vacancies 
-                    WHERE salary_from IS NOT NULL
-                ) OR v.salary_to > (
-                    SELECT AVG(salary_to) 
-                    FROM vacancies 
-                    WHERE salary_to IS NOT NULL
-                )
-                ORDER BY COALESCE(v.salary_from, v.salary_to) DESC
-            """
-            cur.execute(query)
-            return cur.fetchall()
+        return self._fetch_all(self._get_vacancies_with_higher_salary_sql())
+
+    @staticmethod
+    def _get_vacancies_with_higher_salary_sql() -> Tuple[Any, Any]:
+        """Запрос и параметры для get_vacancies_with_higher_salary"""
+        query = """
+            SELECT e.name as company, v.title, 
+                   v.salary_from, v.salary_to, v.currency, v.url
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            WHERE v.salary_from > (
+                SELECT AVG(salary_from) 
+                FROM vacancies 
+                WHERE salary_from IS NOT NULL
+            ) OR v.salary_to > (
+                SELECT AVG(salary_to) 
+                FROM vacancies 
+                WHERE salary_to IS NOT NULL
+            )
+            ORDER BY COALESCE(v.salary_from, v.salary_to) DESC
+        """
+        return query, ()
 
+    @cached_query
     def get_vacancies_with_keyword(self, keyword: str) -> List[Dict[str, Any]]:
         """
         Получает список всех вакансий, в названии которых содержатся переданные слова
@@ -117,18 +243,22 @@ class DBManager:
         :param keyword: Ключевое слово для поиска
         :return: Список словарей с информацией о вакансиях
         """
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = sql.SQL("""
-                SELECT e.name as company, v.title, 
-                       v.salary_from, v.salary_to, v.currency, v.url
-                FROM vacancies v
-                JOIN employers e ON v.employer_id = e.id
-                WHERE v.title ILIKE %s
-                ORDER BY e.name, v.title
-            """)
-            cur.execute(query, (f'%{keyword}%',))
-            return cur.fetchall()
+        return self._fetch_all(self._get_vacancies_with_keyword_sql(keyword))
 
+    @staticmethod
+    def _get_vacancies_with_keyword_sql(keyword: str) -> Tuple[Any, Any]:
+        """Запрос и параметры для get_vacancies_with_keyword"""
+        query = sql.SQL("""
+            SELECT e.name as company, v.title, 
+                   v.salary_from, v.salary_to, v.currency, v.url
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            WHERE v.title ILIKE %s
+            ORDER BY e.name, v.title
+        """)
+        return query, (f'%{keyword}%',)
+
+    @cached_query
     def get_vacancies_by_city(self, city: str) -> List[Dict[str, Any]]:
         """
         Получает список вакансий в указанном городе
@@ -136,18 +266,22 @@ class DBManager:
         :param city: Название города
         :return: Список словарей с информацией о вакансиях
         """
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            query = """
-                SELECT e.name as company, v.title, 
-                       v.salary_from, v.salary_to, v.currency, v.url
-                FROM vacancies v
-                JOIN employers e ON v.employer_id = e.id
-                WHERE v.city ILIKE %s
-                ORDER BY e.name, v.title
-            """
-            cur.execute(query, (f'%{city}%',))
-            return cur.fetchall()
+        return self._fetch_all(self._get_vacancies_by_city_sql(city))
 
+    @staticmethod
+    def _get_vacancies_by_city_sql(city: str) -> Tuple[Any, Any]:
+        """Запрос и параметры для get_vacancies_by_city"""
+        query = """
+            SELECT e.name as company, v.title, 
+                   v.salary_from, v.salary_to, v.currency, v.url
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            WHERE v.city ILIKE %s
+            ORDER BY e.name, v.title
+        """
+        return query, (f'%{city}%',)
+
+    @cached_query
     def get_cities_with_counts(self) -> List[Dict[str, Any]]:
         """
         Получает список городов с количеством вакансий
@@ -175,7 +309,10 @@ class DBManager:
             query = """
                 INSERT INTO employers (id, name, url, open_vacancies)
                 VALUES (%s, %s, %s, %s)
-                ON CONFLICT (id) DO NOTHING
+                ON CONFLICT (id) DO UPDATE SET
+                    name = EXCLUDED.name,
+                    url = EXCLUDED.url,
+                    open_vacancies = EXCLUDED.open_vacancies
             """
             cur.execute(query, (
                 employer['id'],
@@ -183,6 +320,94 @@ class DBManager:
                 employer['url'],
                 employer['open_vacancies']
             ))
+        self._bump_generation()
+
+    def insert_stub_employers(self, employers: List[Dict[str, Any]]) -> None:
+        """
+        Пакетно добавляет работодателей, которых еще нет в БД (уже сохраненные не изменяются).
+        Используется перед вставкой вакансий из архивов, где о работодателе известны только ID и название.
+
+        :param employers: Список словарей с информацией о работодателях
+        """
+        if not employers:
+            return
+        with self.conn.cursor() as cur:
+            query = """
+                INSERT INTO employers (id, name, url, open_vacancies)
+                VALUES %s
+                ON CONFLICT (id) DO NOTHING
+            """
+            execute_values(cur, query, [(
+                employer['id'],
+                employer['name'],
+                employer['url'],
+                employer['open_vacancies']
+            ) for employer in employers], page_size=1000)
+        self._bump_generation()
+
+    def get_employer_resolutions(self, queries: List[str], ttl_days: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Получает сохраненные сопоставления названий компаний с работодателями
+
+        :param queries: Список названий компаний
+        :param ttl_days: Срок актуальности сопоставления в днях
+        :return: Словарь {название: информация о сопоставлении и работодателе}
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            query = """
+                SELECT r.query, r.employer_id, r.ambiguous, r.candidates, r.pinned,
+                       NOT r.pinned AND r.resolved_at < NOW() - %s * INTERVAL '1 day' as stale,
+                       e.name, e.url, e.open_vacancies
+                FROM employer_resolutions r
+                LEFT JOIN employers e ON r.employer_id = e.id
+                WHERE r.query = ANY(%s)
+            """
+            cur.execute(query, (ttl_days, list(queries)))
+            return {row['query']: row for row in cur.fetchall()}
+
+    def save_employer_resolution(self, query: str, employer_id: Optional[str],
+                                 ambiguous: bool = False,
+                                 candidates: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Сохраняет результат поиска работодателя по названию.
+        Закрепленные вручную сопоставления не перезаписываются.
+
+        :param query: Название компании
+        :param employer_id: ID найденного работодателя (None, если не найден)
+        :param ambiguous: Найдено несколько подходящих работодателей
+        :param candidates: Список найденных кандидатов
+        """
+        with self.conn.cursor() as cur:
+            query_sql = """
+                INSERT INTO employer_resolutions (query, employer_id, ambiguous, candidates, resolved_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON CONFLICT (query) DO UPDATE SET
+                    employer_id = EXCLUDED.employer_id,
+                    ambiguous = EXCLUDED.ambiguous,
+                    candidates = EXCLUDED.candidates,
+                    resolved_at = EXCLUDED.resolved_at
+                WHERE NOT employer_resolutions.pinned
+            """
+            cur.execute(query_sql, (query, employer_id, ambiguous, Json(candidates or [])))
+
+    def pin_employer(self, query: str, employer_id: str) -> None:
+        """
+        Закрепляет за названием компании конкретного работодателя
+
+        :param query: Название компании
+        :param employer_id: ID работодателя на HH
+        """
+        with self.conn.cursor() as cur:
+            query_sql = """
+                INSERT INTO employer_resolutions (query, employer_id, pinned, resolved_at)
+                VALUES (%s, %s, TRUE, NOW())
+                ON CONFLICT (query) DO UPDATE SET
+                    employer_id = EXCLUDED.employer_id,
+                    ambiguous = FALSE,
+                    pinned = TRUE,
+                    resolved_at = EXCLUDED.resolved_at
+            """
+            cur.execute(query_sql, (query, employer_id))
 
     def insert_vacancy(self, vacancy: Dict[str, Any]) -> None:
         """
@@ -195,10 +420,10 @@ class DBManager:
                 INSERT INTO vacancies (
                     id, employer_id, title, 
                     salary_from, salary_to, currency, 
-                    url, description
+                    url, description, city, published_at
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (id) DO NOTHING
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (id) DO UPDATE SET published_at = EXCLUDED.published_at
             """
             cur.execute(query, (
                 vacancy['id'],
@@ -208,5 +433,223 @@ class DBManager:
                 vacancy['salary_to'],
                 vacancy['currency'],
                 vacancy['url'],
-                vacancy['description']
+                vacancy['description'],
+                vacancy.get('city'),
+                vacancy.get('published_at')
             ))
+        self._bump_generation()
+
+    def insert_vacancies(self, records: List[tuple]) -> None:
+        """
+        Пакетно добавляет вакансии в БД
+
+        :param records: Список кортежей с полями в порядке VACANCY_FIELDS (см. src.batch_parser)
+        """
+        # В одном INSERT ... ON CONFLICT DO UPDATE строка не может обновляться дважды
+        records = list({record[0]: record for record in records}.values())
+        if not records:
+            return
+        with self.conn.cursor() as cur:
+            query = """
+                INSERT INTO vacancies (
+                    id, employer_id, title,
+                    salary_from, salary_to, currency,
+                    url, description, city, published_at
+                )
+                VALUES %s
+                ON CONFLICT (id) DO UPDATE SET published_at = EXCLUDED.published_at
+            """
+            execute_values(cur, query, records, page_size=1000)
+        self._bump_generation()
+
+    def get_vacancies_for_enrichment(self, ttl_days: int, limit: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """
+        Получает вакансии, для которых нужно загрузить подробную информацию:
+        еще не загруженную, устаревшую или опубликованную заново после загрузки.
+        Снятые с публикации вакансии пропускаются, пока их не опубликуют заново.
+
+        :param ttl_days: Срок актуальности подробной информации в днях
+        :param limit: Максимальное количество вакансий
+        :return: Словарь {ID вакансии: хэш сохраненной подробной информации}
+        """
+        with self.conn.cursor() as cur:
+            query = """
+                SELECT id, detail_hash
+                FROM vacancies
+                WHERE (detail_removed_at IS NULL OR published_at > detail_removed_at)
+                  AND (detail_fetched_at IS NULL
+                       OR detail_fetched_at < NOW() - %s * INTERVAL '1 day'
+                       OR published_at > detail_fetched_at)
+                ORDER BY detail_fetched_at NULLS FIRST, id
+                LIMIT %s
+            """
+            cur.execute(query, (ttl_days, limit))
+            return dict(cur.fetchall())
+
+    def update_vacancy_details(self, details: List[Dict[str, Any]]) -> None:
+        """
+        Пакетно сохраняет подробную информацию о вакансиях
+
+        :param details: Список словарей с подробной информацией (см. HeadHunterAPI.get_vacancy_details)
+        """
+        if not details:
+            return
+        with self.conn.cursor() as cur:
+            query = """
+                UPDATE vacancies v SET
+                    description = d.description,
+                    key_skills = d.key_skills,
+                    experience = d.experience,
+                    employment = d.employment,
+                    detail_hash = d.detail_hash,
+                    detail_fetched_at = NOW(),
+                    detail_removed_at = NULL
+                FROM (VALUES %s) AS d (id, description, key_skills, experience, employment, detail_hash)
+                WHERE v.id = d.id
+            """
+            execute_values(cur, query, [(
+                item['id'],
+                item['description'],
+                item['key_skills'],
+                item['experience'],
+                item['employment'],
+                item['detail_hash']
+            ) for item in details], template="(%s, %s, %s::text[], %s, %s, %s)")
+
+        # Навыки сохраняются вместе с подробной информацией, там же увеличивается поколение данных
+        self.add_vacancy_skills({item['id']: item['key_skills'] for item in details}, 'key_skills', replace=True)
+
+    def touch_vacancy_details(self, vacancy_ids: List[str]) -> None:
+        """
+        Отмечает подробную информацию о вакансиях как актуальную без перезаписи
+
+        :param vacancy_ids: Список ID вакансий, подробная информация которых не изменилась
+        """
+        if not vacancy_ids:
+            return
+        with self.conn.cursor() as cur:
+            query = "UPDATE vacancies SET detail_fetched_at = NOW(), detail_removed_at = NULL WHERE id = ANY(%s)"
+            cur.execute(query, (list(vacancy_ids),))
+
+    def mark_vacancies_removed(self, vacancy_ids: List[str]) -> None:
+        """
+        Отмечает вакансии как снятые с публикации (API вернул 404), чтобы не запрашивать их повторно
+
+        :param vacancy_ids: Список ID снятых с публикации вакансий
+        """
+        if not vacancy_ids:
+            return
+        with self.conn.cursor() as cur:
+            query = "UPDATE vacancies SET detail_fetched_at = NOW(), detail_removed_at = NOW() WHERE id = ANY(%s)"
+            cur.execute(query, (list(vacancy_ids),))
+
+    def get_skill_names(self) -> List[str]:
+        """
+        Получает названия всех известных навыков
+
+        :return: Список названий навыков
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT title FROM skills")
+            return [row[0] for row in cur.fetchall()]
+
+    def add_vacancy_skills(self, vacancy_skills: Dict[str, List[str]], source: str, replace: bool = False) -> None:
+        """
+        Пакетно связывает вакансии с навыками, добавляя новые навыки в справочник
+
+        :param vacancy_skills: Словарь {ID вакансии: список названий навыков}
+        :param source: Источник навыков ('key_skills' или 'snippet')
+        :param replace: Удалить ранее сохраненные навыки вакансий из этого источника
+        """
+        if not vacancy_skills:
+            return
+        rows = {}
+        for vacancy_id, names in vacancy_skills.items():
+            for title in names:
+                name = SkillExtractor.normalize(title)[:100]
+                if name:
+                    rows[(vacancy_id, name)] = title.strip()[:100]
+
+        with self.conn.cursor() as cur:
+            if replace:
+                cur.execute(
+                    "DELETE FROM vacancy_skills WHERE vacancy_id = ANY(%s) AND source = %s",
+                    (list(vacancy_skills), source)
+                )
+            if rows:
+                skills = {name: title for (_, name), title in rows.items()}
+                execute_values(
+                    cur,
+                    "INSERT INTO skills (name, title) VALUES %s ON CONFLICT (name) DO NOTHING",
+                    list(skills.items())
+                )
+                execute_values(cur, """
+                    INSERT INTO vacancy_skills (skill_id, vacancy_id, source)
+                    SELECT s.id, d.vacancy_id, d.source
+                    FROM (VALUES %s) AS d (vacancy_id, name, source)
+                    JOIN skills s ON s.name = d.name
+                    ON CONFLICT (skill_id, vacancy_id) DO NOTHING
+                """, [(vacancy_id, name, source) for vacancy_id, name in rows])
+        self._bump_generation()
+
+    @cached_query
+    def get_top_skills(self, employer_id: Optional[str] = None, city: Optional[str] = None,
+                       limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Получает самые востребованные навыки с количеством вакансий и средней зарплатой
+
+        :param employer_id: ID работодателя для фильтрации (опционально)
+        :param city: Город для фильтрации без учета регистра (опционально)
+        :param limit: Количество навыков
+        :return: Список словарей с информацией о навыках
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            query = """
+                SELECT s.title as skill, COUNT(*) as vacancies_count,
+                       AVG(v.salary_from) as avg_salary_from,
+                       AVG(v.salary_to) as avg_salary_to
+                FROM vacancy_skills vs
+                JOIN skills s ON vs.skill_id = s.id
+                JOIN vacancies v ON vs.vacancy_id = v.id
+                WHERE (%(employer_id)s IS NULL OR v.employer_id = %(employer_id)s)
+                  AND (%(city)s IS NULL OR lower(v.city) = lower(%(city)s))
+                GROUP BY s.id
+                ORDER BY vacancies_count DESC, s.title
+                LIMIT %(limit)s
+            """
+            cur.execute(query, {'employer_id': employer_id, 'city': city.strip() if city else None, 'limit': limit})
+            return cur.fetchall()
+
+    @cached_query
+    def get_vacancies_with_skills(self, skills: List[str], match_all: bool = True) -> List[Dict[str, Any]]:
+        """
+        Получает список вакансий, требующих указанные навыки
+
+        :param skills: Список названий навыков
+        :param match_all: Вакансия должна требовать все навыки (иначе хотя бы один)
+        :return: Список словарей с информацией о вакансиях
+        """
+        return self._fetch_all(self._get_vacancies_with_skills_sql(skills, match_all))
+
+    @staticmethod
+    def _get_vacancies_with_skills_sql(skills: List[str], match_all: bool = True) -> Optional[Tuple[Any, Any]]:
+        """Запрос и параметры для get_vacancies_with_skills (None - результат заведомо пуст)"""
+        names = list({SkillExtractor.normalize(skill) for skill in skills} - {''})
+        if not names:
+            return None
+        query = """
+            SELECT e.name as company, v.title,
+                   v.salary_from, v.salary_to, v.currency, v.url
+            FROM (
+                SELECT vs.vacancy_id
+                FROM skills s
+                JOIN vacancy_skills vs ON vs.skill_id = s.id
+                WHERE s.name = ANY(%s)
+                GROUP BY vs.vacancy_id
+                HAVING COUNT(*) >= %s
+            ) m
+            JOIN vacancies v ON m.vacancy_id = v.id
+            JOIN employers e ON v.employer_id = e.id
+            ORDER BY COALESCE(v.salary_from, v.salary_to) DESC NULLS LAST, e.name
+        """
+        return query, (names, len(names) if match_all else 1)
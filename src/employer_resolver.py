@@ -0,0 +1,103 @@
+from typing import List, Dict, Any, Optional
+
+from src.db_manager import DBManager
+from src.hh_api import HeadHunterAPI
+
+
+class EmployerResolver:
+    """Класс для сопоставления названий компаний с работодателями HH с кэшированием в БД"""
+
+    def __init__(self, hh_api: HeadHunterAPI, db_manager: DBManager, ttl_days: int = 7, max_workers: int = 5):
+        """
+        Инициализация сопоставителя работодателей
+
+        :param hh_api: Клиент API HeadHunter
+        :param db_manager: Менеджер БД, в которой хранятся сопоставления
+        :param ttl_days: Через сколько дней сопоставление нужно обновить
+        :param max_workers: Количество параллельных запросов к API
+        """
+        self.hh_api = hh_api
+        self.db_manager = db_manager
+        self.ttl_days = ttl_days
+        self.max_workers = max_workers
+        self.ambiguous = []
+
+    def resolve(self, employer_names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Получение работодателей по названиям. Обращается к API только для названий,
+        которых нет в БД или сопоставление которых устарело.
+        Неоднозначные сопоставления сохраняются в атрибуте ambiguous.
+
+        :param employer_names: Список названий компаний
+        :return: Список словарей с информацией о компаниях
+        """
+        cached = self.db_manager.get_employer_resolutions(employer_names, self.ttl_days)
+        resolved = {}
+        to_search = []
+
+        for name in employer_names:
+            row = cached.get(name)
+            if row is None or row['stale']:
+                to_search.append(name)
+            elif row['employer_id'] is None:
+                continue
+            elif row['name'] is None:
+                # Закрепленный вручную работодатель, которого еще нет в таблице employers
+                employer = self.hh_api.get_employer(row['employer_id'])
+                if employer:
+                    self.db_manager.insert_employer(employer)
+                    resolved[name] = employer
+            else:
+                resolved[name] = self._cached_employer(row)
+
+        self.ambiguous = [
+            {'query': name, 'employer': resolved[name], 'candidates': cached[name]['candidates']}
+            for name in employer_names
+            if name in resolved and cached[name]['ambiguous']
+        ]
+
+        for result in self.hh_api.find_employers(to_search, self.max_workers):
+            if result['error']:
+                # Обновить устаревшее сопоставление не удалось - сохраненный работодатель по-прежнему подходит
+                row = cached.get(result['query'])
+                employer = self._cached_employer(row) if row else None
+                if employer:
+                    resolved[result['query']] = employer
+                    if row['ambiguous']:
+                        self.ambiguous.append(
+                            {'query': result['query'], 'employer': employer, 'candidates': row['candidates']}
+                        )
+                continue
+            employer = result['employer']
+            if employer:
+                self.db_manager.insert_employer(employer)
+                resolved[result['query']] = employer
+                if result['ambiguous']:
+                    self.ambiguous.append(result)
+            self.db_manager.save_employer_resolution(
+                result['query'],
+                employer['id'] if employer else None,
+                result['ambiguous'],
+                result['candidates']
+            )
+
+        employers = []
+        seen = set()
+        for name in employer_names:
+            employer = resolved.get(name)
+            if employer and employer['id'] not in seen:
+                seen.add(employer['id'])
+                employers.append(employer)
+        return employers
+
+    @staticmethod
+    def _cached_employer(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Работодатель из сохраненного сопоставления (None, если его нет в таблице employers)"""
+        if row['employer_id'] is None or row['name'] is None:
+            return None
+        return {
+            'id': row['employer_id'],
+            'name': row['name'],
+            'url': row['url'],
+            'open_vacancies': row['open_vacancies']
+        }
@@ -1,4 +1,10 @@
+import hashlib
+import html
+import json
+import re
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
 import requests
@@ -21,10 +27,19 @@ class JobAPI(ABC):
 class HeadHunterAPI(JobAPI):
     """Класс для работы с API HeadHunter"""
 
+    # Повторы запросов вакансий при временных ошибках: количество и начальная пауза в секундах (удваивается)
+    REQUEST_RETRIES = 3
+    REQUEST_BACKOFF = 1.0
+    # Ответы, после которых запрос имеет смысл повторить
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
     def __init__(self):
         self.__base_url = "https://api.hh.ru/"
         self.__headers = {'User-Agent': 'HHVacancyParser/1.0'}
         self.__connected = False
+        self.__areas = None
+        # До этого момента (time.monotonic) все потоки ждут, если API попросил снизить частоту запросов
+        self.__paused_until = 0.0
 
     def connect(self) -> None:
         """Подключение к API"""
@@ -35,35 +50,84 @@ class HeadHunterAPI(JobAPI):
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f"Ошибка подключения к API HH: {e}")
 
-    def get_employers(self, employer_names: List[str]) -> List[Dict[str, Any]]:
+    def get_employers(self, employer_names: List[str], max_workers: int = 5) -> List[Dict[str, Any]]:
         """
         Получение информации о работодателях по их названиям
 
         :param employer_names: Список названий компаний
+        :param max_workers: Количество параллельных запросов
         :return: Список словарей с информацией о компаниях
         """
+        results = self.find_employers(employer_names, max_workers)
+        return [result['employer'] for result in results if result['employer']]
+
+    def find_employers(self, employer_names: List[str], max_workers: int = 5) -> List[Dict[str, Any]]:
+        """
+        Параллельный поиск работодателей по названиям
+
+        :param employer_names: Список названий компаний
+        :param max_workers: Количество параллельных запросов
+        :return: Список результатов поиска в порядке названий (см. find_employer)
+        """
+        if not employer_names:
+            return []
         if not self.__connected:
             self.connect()
 
-        employers = []
-        for name in employer_names:
-            params = {'text': name, 'only_with_vacancies': True, 'per_page': 1}
-            try:
-                response = requests.get(f"{self.__base_url}employers", params=params, headers=self.__headers)
-                response.raise_for_status()
-                data = response.json()
-                if data['items']:
-                    employer = data['items'][0]
-                    employers.append({
-                        'id': employer['id'],
-                        'name': employer['name'],
-                        'url': employer['alternate_url'],
-                        'open_vacancies': employer['open_vacancies']
-                    })
-            except requests.exceptions.RequestException as e:
-                print(f"Ошибка при получении данных работодателя {name}: {e}")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.find_employer, employer_names))
+
+    def find_employer(self, name: str, per_page: int = 10) -> Dict[str, Any]:
+        """
+        Поиск работодателя по названию с выбором наиболее подходящего
+
+        :param name: Название компании
+        :param per_page: Количество рассматриваемых кандидатов
+        :return: Словарь с ключами query, employer, candidates, ambiguous, error
+        """
+        result = {'query': name, 'employer': None, 'candidates': [], 'ambiguous': False, 'error': False}
+        params = {'text': name, 'only_with_vacancies': True, 'per_page': per_page}
+        try:
+            response = requests.get(f"{self.__base_url}employers", params=params, headers=self.__headers)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"Ошибка при получении данных работодателя {name}: {e}")
+            result['error'] = True
+            return result
+
+        candidates = [self._parse_employer(item) for item in data.get('items', [])]
+        if candidates:
+            exact = [c for c in candidates if c['name'].casefold() == name.strip().casefold()]
+            result['candidates'] = candidates
+            result['employer'] = (exact or candidates)[0]
+            result['ambiguous'] = len(exact) != 1 and len(candidates) > 1
+        return result
+
+    def get_employer(self, employer_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Получение информации о работодателе по ID
+
+        :param employer_id: ID работодателя
+        :return: Словарь с информацией о компании или None
+        """
+        try:
+            response = requests.get(f"{self.__base_url}employers/{employer_id}", headers=self.__headers)
+            response.raise_for_status()
+            return self._parse_employer(response.json())
+        except requests.exceptions.RequestException as e:
+            print(f"Ошибка при получении данных работодателя {employer_id}: {e}")
+            return None
 
-        return employers
+    @staticmethod
+    def _parse_employer(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Приватный метод парсинга работодателя"""
+        return {
+            'id': item['id'],
+            'name': item['name'],
+            'url': item.get('alternate_url'),
+            'open_vacancies': item.get('open_vacancies')
+        }
 
     def get_vacancies(self, employer_id: str, city_id: Optional[str] = None, per_page: int = 100) -> List[
         Dict[str, Any]]:
@@ -95,27 +159,115 @@ class HeadHunterAPI(JobAPI):
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f"Ошибка при запросе вакансий: {e}")
 
+    def search_vacancies(self, params: Dict[str, Any], page: int = 0, per_page: int = 100) -> Dict[str, Any]:
+        """
+        Одна страница поиска вакансий с произвольными параметрами (с повторами, см. _request)
+
+        :param params: Параметры поиска (employer_id, area, date_from, date_to и т.д.)
+        :param page: Номер страницы
+        :param per_page: Количество вакансий на странице
+        :return: Словарь с ключами found (всего найдено) и items (вакансии страницы)
+        """
+        if not self.__connected:
+            self.connect()
+
+        try:
+            response = self._request(
+                f"{self.__base_url}vacancies",
+                {**params, 'page': page, 'per_page': per_page, 'locale': 'RU'}
+            )
+            response.raise_for_status()
+            data = response.json()
+            return {'found': data.get('found', 0), 'items': self._parse_vacancies(data.get('items', []))}
+        except requests.exceptions.RequestException as e:
+            raise ConnectionError(f"Ошибка при запросе вакансий: {e}")
+
+    def _request(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """
+        GET-запрос с повторами: при сетевых ошибках и ответах RETRY_STATUSES запрос повторяется
+        REQUEST_RETRIES раз с растущей паузой (или паузой из заголовка Retry-After).
+        Пауза общая для всех потоков, чтобы при ограничении частоты замедлялись все запросы сразу.
+
+        :param url: Адрес запроса
+        :param params: Параметры запроса
+        :return: Ответ API (последний, если повторы не помогли)
+        """
+        for attempt in range(self.REQUEST_RETRIES + 1):
+            wait = self.__paused_until - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            delay = self.REQUEST_BACKOFF * 2 ** attempt
+            try:
+                response = requests.get(url, params=params, headers=self.__headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.REQUEST_RETRIES:
+                    raise
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.REQUEST_RETRIES:
+                return response
+            retry_after = response.headers.get('Retry-After', '')
+            self.__paused_until = max(self.__paused_until,
+                                      time.monotonic() + (float(retry_after) if retry_after.isdigit() else delay))
+
     def _parse_vacancies(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Приватный метод парсинга вакансий"""
-        parsed_vacancies = []
-        for item in items:
-            salary = item.get('salary')
-            address = item.get('address')
-            city = address.get('city') if address else None
-
-            vacancy = {
-                'id': item.get('id'),
-                'employer_id': item.get('employer', {}).get('id'),
-                'title': item.get('name'),
-                'salary_from': salary.get('from') if salary else None,
-                'salary_to': salary.get('to') if salary else None,
-                'currency': salary.get('currency') if salary else None,
-                'url': item.get('alternate_url'),
-                'description': item.get('snippet', {}).get('requirement', ''),
-                'city': city
-            }
-            parsed_vacancies.append(vacancy)
-        return parsed_vacancies
+        return [self._parse_vacancy(item) for item in items]
+
+    @staticmethod
+    def _parse_vacancy(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Приватный метод парсинга одной вакансии из результатов поиска"""
+        salary = item.get('salary')
+        address = item.get('address')
+        city = address.get('city') if address else None
+
+        return {
+            'id': item.get('id'),
+            'employer_id': item.get('employer', {}).get('id'),
+            'title': item.get('name'),
+            'salary_from': salary.get('from') if salary else None,
+            'salary_to': salary.get('to') if salary else None,
+            'currency': salary.get('currency') if salary else None,
+            'url': item.get('alternate_url'),
+            'description': item.get('snippet', {}).get('requirement', ''),
+            'city': city,
+            'published_at': item.get('published_at')
+        }
+
+    def get_vacancy_details(self, vacancy_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Получение подробной информации о вакансии (с повторами при временных ошибках, см. _request)
+
+        :param vacancy_id: ID вакансии
+        :return: Словарь с подробной информацией, {'id': ..., 'removed': True} для снятой с публикации
+            вакансии (ответ 404) или None при временной ошибке
+        """
+        try:
+            response = self._request(f"{self.__base_url}vacancies/{vacancy_id}")
+            if response.status_code == 404:
+                return {'id': vacancy_id, 'removed': True}
+            response.raise_for_status()
+            return self._parse_vacancy_details(response.json())
+        except requests.exceptions.RequestException as e:
+            print(f"Ошибка при получении вакансии {vacancy_id}: {e}")
+            return None
+
+    @staticmethod
+    def _parse_vacancy_details(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Приватный метод парсинга подробной информации о вакансии"""
+        description = html.unescape(re.sub(r'<[^>]+>', ' ', item.get('description') or ''))
+        details = {
+            'id': item.get('id'),
+            'description': ' '.join(description.split()),
+            'key_skills': [skill['name'] for skill in item.get('key_skills') or []],
+            'experience': (item.get('experience') or {}).get('name'),
+            'employment': (item.get('employment') or {}).get('name')
+        }
+        payload = json.dumps(details, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        details['detail_hash'] = hashlib.md5(payload).hexdigest()
+        return details
 
     def get_areas(self, city_name: str) -> List[Dict[str, Any]]:
         """
@@ -124,16 +276,25 @@ class HeadHunterAPI(JobAPI):
         :param city_name: Название города
         :return: Список подходящих локаций
         """
-        if not self.__connected:
-            self.connect()
+        return self._find_city_id(self.get_areas_tree(), city_name)
 
-        try:
-            response = requests.get(f"{self.__base_url}areas", headers=self.__headers)
-            response.raise_for_status()
-            areas = response.json()
-            return self._find_city_id(areas, city_name)
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"Ошибка при запросе регионов: {e}")
+    def get_areas_tree(self) -> List[Dict[str, Any]]:
+        """
+        Получение дерева регионов (запрашивается один раз и запоминается)
+
+        :return: Список регионов верхнего уровня с вложенными регионами в ключе areas
+        """
+        if self.__areas is None:
+            if not self.__connected:
+                self.connect()
+
+            try:
+                response = requests.get(f"{self.__base_url}areas", headers=self.__headers)
+                response.raise_for_status()
+                self.__areas = response.json()
+            except requests.exceptions.RequestException as e:
+                raise ConnectionError(f"Ошибка при запросе регионов: {e}")
+        return self.__areas
 
     def _find_city_id(self, areas: List[Dict[str, Any]], city_name: str) -> List[Dict[str, Any]]:
         """
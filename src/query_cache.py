@@ -0,0 +1,183 @@
+import functools
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """Класс для кэширования результатов запросов к БД с вытеснением давно не используемых (LRU).
+    Может использоваться из нескольких потоков."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, path: Optional[str] = None):
+        """
+        Инициализация кэша
+
+        :param max_bytes: Максимальный суммарный размер сохраненных результатов в байтах
+        :param path: Файл для сохранения кэша между запусками (опционально). Содержимое файла
+            десериализуется pickle, поэтому он должен находиться в каталоге, доступном только пользователю.
+        """
+        self.max_bytes = max_bytes
+        self.path = path
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Ключ -> (поколение данных, результат в сериализованном виде)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path:
+            self.load()
+
+    def get(self, key: Hashable, generation: Hashable) -> Tuple[bool, Any]:
+        """
+        Получение результата из кэша
+
+        :param key: Ключ запроса
+        :param generation: Текущее поколение данных в БД
+        :return: Кортеж (найден ли результат, результат)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Каждый раз возвращаем новую копию, чтобы изменения результата не попадали в кэш
+        return True, pickle.loads(entry[1])
+
+    def put(self, key: Hashable, generation: Hashable, value: Any) -> None:
+        """
+        Сохранение результата в кэш
+
+        :param key: Ключ запроса
+        :param generation: Поколение данных, для которого получен результат
+        :param value: Результат запроса
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if len(data) > self.max_bytes:
+                return
+
+            self._entries[key] = (generation, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Очистка кэша"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика использования кэша
+
+        :return: Словарь с количеством попаданий, промахов, вытеснений, записей, размером и долей попаданий
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'hit_rate': self.hits / requests if requests else 0.0
+        }
+
+    def load(self) -> None:
+        """
+        Загрузка кэша из файла. Отсутствующий файл игнорируется; поврежденный файл,
+        файл другого пользователя или доступный на запись другим удаляется.
+        """
+        try:
+            with open(self.path, 'rb') as file:
+                info = os.fstat(file.fileno())
+                if hasattr(os, 'getuid') and (info.st_uid != os.getuid() or info.st_mode & 0o022):
+                    raise PermissionError(f"Файл кэша {self.path} небезопасно загружать")
+                entries = pickle.load(file)
+            loaded = OrderedDict()
+            for key, (generation, data) in entries.items():
+                if not isinstance(data, bytes):
+                    raise TypeError("Результат в файле кэша должен быть сериализован в байты")
+                loaded[key] = (generation, data)
+        except FileNotFoundError:
+            return
+        except Exception:
+            self._remove_file()
+            return
+
+        self.clear()
+        with self._lock:
+            self._entries = loaded
+            self.size = sum(len(data) for _, data in loaded.values())
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def save(self) -> None:
+        """Сохранение кэша в файл (каталог создается с доступом только для пользователя)"""
+        if not self.path:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as file:
+            pickle.dump(entries, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def _remove_file(self) -> None:
+        """Удаление файла кэша, который не удалось загрузить"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _remove(self, key: Hashable) -> None:
+        """Удаление записи из кэша"""
+        _, data = self._entries.pop(key)
+        self.size -= len(data)
+
+
+def cached_query(method: Callable) -> Callable:
+    """
+    Декоратор для методов DBManager, результаты которых кэшируются.
+    Ключ кэша - имя метода и переданные параметры.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None:
+            return method(self, *args, **kwargs)
+
+        key = (method.__name__, _freeze(args), _freeze(kwargs))
+        generation = self.get_generation()
+        hit, value = self.cache.get(key, generation)
+        if not hit:
+            value = method(self, *args, **kwargs)
+            self.cache.put(key, generation, value)
+        return value
+
+    return wrapper
+
+
+def _freeze(value: Any) -> Hashable:
+    """Приведение параметров запроса к хэшируемому виду для использования в ключе кэша"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
@@ -0,0 +1,311 @@
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+
+from src.db_manager import DBManager
+from src.query_cache import QueryCache
+
+
+class DBManagerPool:
+    """Пул менеджеров БД (по одному соединению на менеджер), доступных только для чтения"""
+
+    def __init__(self, size: int, factory: Callable[[], DBManager], timeout: float = 5.0):
+        """
+        Инициализация пула
+
+        :param size: Количество соединений с БД
+        :param factory: Функция, создающая DBManager
+        :param timeout: Сколько секунд ждать свободного соединения
+        """
+        self.size = size
+        self.factory = factory
+        self.timeout = timeout
+        self._managers = queue.Queue()
+        for _ in range(size):
+            self._managers.put(self.create())
+
+    def create(self) -> DBManager:
+        """
+        Создание менеджера БД с соединением только для чтения (вне очереди пула)
+
+        :return: Менеджер БД
+        """
+        db_manager = self.factory()
+        db_manager.conn.set_session(readonly=True, autocommit=True)
+        return db_manager
+
+    @contextmanager
+    def acquire(self) -> Iterator[DBManager]:
+        """
+        Получение свободного менеджера БД на время запроса.
+        Менеджер, соединение которого закрылось из-за ошибки, заменяется новым.
+
+        :return: Менеджер БД
+        :raises TimeoutError: Если за timeout секунд не освободилось ни одно соединение
+        """
+        try:
+            db_manager = self._managers.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("Нет свободных соединений с БД")
+        try:
+            yield db_manager
+        except Exception:
+            if db_manager.conn.closed:
+                try:
+                    db_manager = self.create()
+                except Exception:
+                    # БД недоступна: закрытый менеджер останется в пуле и будет заменен при следующей ошибке
+                    pass
+            raise
+        finally:
+            self._managers.put(db_manager)
+
+
+class QueryService:
+    """Класс, сопоставляющий HTTP-запросам методы DBManager.
+    Готовые тела ответов кэшируются до следующего изменения данных в БД (см. DBManager.get_generation).
+    Выборки вакансий отдаются потоком NDJSON по мере чтения из курсора БД, в кэш попадают только небольшие."""
+
+    # Путь -> (метод DBManager, отдавать ли результат построчно в формате NDJSON)
+    ROUTES = {
+        '/companies': ('get_companies_and_vacancies_count', False),
+        '/cities': ('get_cities_with_counts', False),
+        '/salary/avg': ('get_avg_salary', False),
+        '/skills/top': ('get_top_skills', False),
+        '/vacancies': ('get_all_vacancies', True),
+        '/vacancies/higher-salary': ('get_vacancies_with_higher_salary', True),
+    }
+
+    def __init__(self, pool: DBManagerPool, cache_max_bytes: int = 32 * 1024 * 1024,
+                 stream_cache_max_bytes: int = 256 * 1024, batch_size: int = 1000,
+                 generation_check_interval: float = 1.0, max_streams: Optional[int] = None):
+        """
+        Инициализация сервиса
+
+        :param pool: Пул менеджеров БД
+        :param cache_max_bytes: Размер кэша ответов в байтах
+        :param stream_cache_max_bytes: Максимальный размер потокового ответа, который еще кэшируется
+        :param batch_size: Количество строк, получаемых из БД и отправляемых клиенту за один раз
+        :param generation_check_interval: Как часто (в секундах) проверять, не изменились ли данные в БД
+        :param max_streams: Сколько потоковых ответов может одновременно занимать соединения пула
+            (по умолчанию на одно меньше размера пула, чтобы медленные клиенты не блокировали остальные запросы)
+        """
+        self.pool = pool
+        self.cache = QueryCache(cache_max_bytes)
+        self.stream_cache_max_bytes = stream_cache_max_bytes
+        self.batch_size = batch_size
+        self.generation_check_interval = generation_check_interval
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._generation_manager = None
+        self._generation_lock = threading.Lock()
+        self._streams = threading.BoundedSemaphore(max_streams or max(pool.size - 1, 1))
+
+    def handle(self, path: str, params: Dict[str, str]) -> Tuple[HTTPStatus, Union[bytes, Iterable[bytes]], bool]:
+        """
+        Выполнение запроса
+
+        :param path: Путь запроса
+        :param params: Параметры запроса
+        :return: Кортеж (статус, тело ответа, является ли тело потоком NDJSON).
+            Тело потока - итератор по частям, которые отправляются клиенту по мере получения из БД.
+        """
+        if path == '/health':
+            return HTTPStatus.OK, _encode({'status': 'ok'}), False
+        if path == '/stats':
+            return HTTPStatus.OK, _encode(self.cache.stats()), False
+        if path not in self.ROUTES:
+            return HTTPStatus.NOT_FOUND, _encode({'error': f"Неизвестный путь {path}"}), False
+
+        method_name, stream = self.ROUTES[path]
+        try:
+            method_name, args = self._resolve(method_name, params)
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, _encode({'error': str(e)}), False
+
+        try:
+            return self._handle_query(method_name, args, stream)
+        except TimeoutError as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, _encode({'error': str(e)}), False
+
+    def _handle_query(self, method_name: str, args: List[Any],
+                      stream: bool) -> Tuple[HTTPStatus, Union[bytes, Iterable[bytes]], bool]:
+        """Выполнение запроса к DBManager с кэшированием ответа"""
+        key = (method_name, tuple(args))
+        generation = self.get_generation()
+        hit, body = self.cache.get(key, generation)
+        if hit:
+            return HTTPStatus.OK, ([body] if stream else body), stream
+
+        if stream:
+            chunks = self._stream(key, generation)
+            # Первая пачка читается сразу, чтобы ошибка запроса вернулась статусом, а не оборванным потоком
+            first = next(chunks, b'')
+            return HTTPStatus.OK, _prepend(first, chunks), True
+
+        with self.pool.acquire() as db_manager:
+            body = _encode(getattr(db_manager, method_name)(*args))
+        self.cache.put(key, generation, body)
+        return HTTPStatus.OK, body, False
+
+    def get_generation(self) -> Any:
+        """
+        Получение поколения данных в БД. Запрашивается через отдельное соединение не чаще,
+        чем раз в generation_check_interval секунд, общее для всех потоков сервиса.
+
+        :return: Поколение данных (см. DBManager.get_generation)
+        """
+        with self._generation_lock:
+            now = time.monotonic()
+            if self._generation is None or now - self._generation_checked_at >= self.generation_check_interval:
+                if self._generation_manager is None:
+                    self._generation_manager = self.pool.create()
+                try:
+                    self._generation = self._generation_manager.get_generation()
+                except Exception:
+                    self._generation_manager = None
+                    raise
+                self._generation_checked_at = now
+            return self._generation
+
+    def _stream(self, key: Tuple[str, Tuple[Any, ...]], generation: Any) -> Iterator[bytes]:
+        """Построчная выдача результата в NDJSON; ответы меньше stream_cache_max_bytes сохраняются в кэш"""
+        method_name, args = key
+        parts = []
+        size = 0
+        if not self._streams.acquire(timeout=self.pool.timeout):
+            raise TimeoutError("Слишком много одновременных потоковых запросов")
+        try:
+            with self.pool.acquire() as db_manager:
+                for rows in db_manager.iter_rows(method_name, *args, batch_size=self.batch_size):
+                    chunk = _encode_rows(rows)
+                    if parts is not None:
+                        size += len(chunk)
+                        if size <= self.stream_cache_max_bytes:
+                            parts.append(chunk)
+                        else:
+                            parts = None
+                    yield chunk
+        finally:
+            self._streams.release()
+        if parts is not None:
+            self.cache.put(key, generation, b''.join(parts))
+
+    @staticmethod
+    def _resolve(method_name: str, params: Dict[str, str]) -> Tuple[str, List[Any]]:
+        """Выбор метода DBManager и его аргументов по параметрам запроса"""
+        if method_name == 'get_top_skills':
+            limit = params.get('limit', '10')
+            if not limit.isdigit():
+                raise ValueError("Параметр limit должен быть целым числом")
+            return method_name, [params.get('employer_id'), params.get('city'), int(limit)]
+
+        if method_name == 'get_all_vacancies':
+            if params.get('keyword'):
+                return 'get_vacancies_with_keyword', [params['keyword']]
+            if params.get('city'):
+                return 'get_vacancies_by_city', [params['city']]
+            if params.get('skills'):
+                skills = tuple(skill for skill in params['skills'].split(',') if skill.strip())
+                return 'get_vacancies_with_skills', [skills, params.get('match', 'all') != 'any']
+
+        return method_name, []
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик HTTP-запросов к сервису (только GET)"""
+
+    protocol_version = 'HTTP/1.1'
+    # Таймаут сокета: клиент, который перестал читать поток, через это время освобождает соединение с БД
+    timeout = 30
+    service: Optional[QueryService] = None
+
+    def do_GET(self) -> None:
+        """Обработка GET-запроса"""
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            status, body, stream = self.service.handle(url.path.rstrip('/') or '/', params)
+        except Exception as e:
+            status, body, stream = HTTPStatus.INTERNAL_SERVER_ERROR, _encode({'error': f"Ошибка запроса: {e}"}), False
+
+        try:
+            self.send_response(status)
+            if stream:
+                self._send_chunked(body)
+            else:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            # Клиент закрыл соединение или перестал читать ответ
+            self.close_connection = True
+
+    def _send_chunked(self, chunks: Iterable[bytes]) -> None:
+        """Отправка NDJSON частями (chunked), чтобы клиент мог обрабатывать строки по мере получения"""
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for chunk in chunks:
+                if chunk:
+                    self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+        except Exception:
+            # Заголовки уже отправлены: обрываем ответ без завершающей части, чтобы клиент увидел ошибку
+            self.close_connection = True
+            raise
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Отключение журнала каждого запроса"""
+        pass
+
+
+def _prepend(first: bytes, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Возврат уже прочитанной первой части потока перед остальными (поток закрывается вместе с итератором)"""
+    try:
+        yield first
+        yield from chunks
+    finally:
+        chunks.close()
+
+
+def _json_default(value: Any) -> Any:
+    """Преобразование типов, которые не поддерживает json (Decimal в результатах AVG)"""
+    return float(value) if isinstance(value, Decimal) else str(value)
+
+
+def _encode(value: Any) -> bytes:
+    """Сериализация результата в JSON"""
+    return json.dumps(value, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def _encode_rows(rows: List[Any]) -> bytes:
+    """Сериализация списка строк результата в NDJSON (по одному JSON-объекту на строку)"""
+    return b''.join(_encode(row) + b'\n' for row in rows)
+
+
+def create_server(service: QueryService, host: str = 'localhost', port: int = 8080) -> ThreadingHTTPServer:
+    """
+    Создание HTTP-сервера сервиса
+
+    :param service: Сервис запросов
+    :param host: Хост
+    :param port: Порт
+    :return: HTTP-сервер (запускается методом serve_forever)
+    """
+    handler = type('BoundQueryRequestHandler', (QueryRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,71 @@
+import re
+from typing import List, Iterable
+
+# Навыки, которые ищутся в тексте вакансий еще до того, как они встретятся в key_skills
+DEFAULT_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'Golang', 'C++', 'C#', 'Kotlin', 'Swift', 'PHP', '1С',
+    'SQL', 'PostgreSQL', 'MySQL', 'Oracle', 'MongoDB', 'Redis', 'ClickHouse', 'Kafka', 'RabbitMQ',
+    'Docker', 'Kubernetes', 'Linux', 'Git', 'CI/CD', 'Ansible', 'Terraform',
+    'Django', 'FastAPI', 'Flask', 'Spring', 'React', 'Vue.js', 'Angular', 'Node.js',
+    'Hadoop', 'Spark', 'Airflow', 'Pandas', 'Machine Learning', 'REST API'
+]
+
+
+class SkillExtractor:
+    """Класс для поиска известных навыков в тексте вакансии"""
+
+    _token_re = re.compile(r'[\w+#./-]+')
+    _max_words = 3
+
+    def __init__(self, skills: Iterable[str] = ()):
+        """
+        Инициализация поиска навыков
+
+        :param skills: Дополнительные навыки (например, уже известные из БД)
+        """
+        self.vocabulary = {}
+        self.add(DEFAULT_SKILLS)
+        self.add(skills)
+
+    @classmethod
+    def normalize(cls, name: str) -> str:
+        """
+        Нормализация названия навыка для сравнения
+
+        :param name: Название навыка
+        :return: Нормализованное название
+        """
+        return ' '.join(cls._tokenize(name))
+
+    @classmethod
+    def _tokenize(cls, text: str) -> List[str]:
+        """Разбиение текста на слова в нижнем регистре без завершающих знаков препинания"""
+        tokens = (token.rstrip('.,/-') for token in cls._token_re.findall(text.casefold()))
+        return [token for token in tokens if token]
+
+    def add(self, skills: Iterable[str]) -> None:
+        """
+        Добавление навыков в словарь
+
+        :param skills: Названия навыков
+        """
+        for skill in skills:
+            name = self.normalize(skill)
+            if name and len(name.split()) <= self._max_words:
+                self.vocabulary.setdefault(name, skill.strip())
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Поиск навыков из словаря в тексте
+
+        :param text: Текст вакансии
+        :return: Список найденных навыков (в исходном написании)
+        """
+        tokens = self._tokenize(text or '')
+        found = {}
+        for size in range(1, self._max_words + 1):
+            for i in range(len(tokens) - size + 1):
+                name = ' '.join(tokens[i:i + size])
+                if name in self.vocabulary:
+                    found.setdefault(name, self.vocabulary[name])
+        return list(found.values())
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from src.db_manager import DBManager
+from src.hh_api import HeadHunterAPI
+
+
+class VacancyEnricher:
+    """Класс для загрузки подробной информации о вакансиях (описание, навыки, опыт, занятость)"""
+
+    def __init__(self, hh_api: HeadHunterAPI, db_manager: DBManager, ttl_days: int = 1,
+                 max_workers: int = 8, batch_size: int = 100):
+        """
+        Инициализация загрузчика подробной информации
+
+        :param hh_api: Клиент API HeadHunter
+        :param db_manager: Менеджер БД с вакансиями
+        :param ttl_days: Через сколько дней подробную информацию нужно обновить
+        :param max_workers: Количество параллельных запросов к API
+        :param batch_size: Количество вакансий, сохраняемых в БД за один раз
+        """
+        self.hh_api = hh_api
+        self.db_manager = db_manager
+        self.ttl_days = ttl_days
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
+    def run(self, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Загрузка подробной информации для вакансий, у которых она отсутствует или устарела.
+        Результаты сохраняются пачками, поэтому прерванную загрузку можно продолжить повторным запуском.
+
+        :param limit: Максимальное количество обрабатываемых вакансий
+        :return: Статистика: обновлено, не изменилось, снято с публикации, ошибок
+        """
+        stats = {'updated': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+        queue = self.db_manager.get_vacancies_for_enrichment(self.ttl_days, limit)
+        vacancy_ids = list(queue)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for start in range(0, len(vacancy_ids), self.batch_size):
+                batch = vacancy_ids[start:start + self.batch_size]
+                changed = []
+                unchanged = []
+                removed = []
+
+                for vacancy_id, details in zip(batch, executor.map(self.hh_api.get_vacancy_details, batch)):
+                    if details is None:
+                        stats['failed'] += 1
+                    elif details.get('removed'):
+                        removed.append(vacancy_id)
+                    elif details['detail_hash'] == queue[vacancy_id]:
+                        unchanged.append(vacancy_id)
+                    else:
+                        changed.append(details)
+
+                self.db_manager.update_vacancy_details(changed)
+                self.db_manager.touch_vacancy_details(unchanged)
+                self.db_manager.mark_vacancies_removed(removed)
+                stats['updated'] += len(changed)
+                stats['unchanged'] += len(unchanged)
+                stats['removed'] += len(removed)
+
+        return stats
@@ -40,7 +40,10 @@ def db_manager(test_db):
     yield db
     # Очистка таблиц после каждого теста
     with db.conn.cursor() as cur:
-        cur.execute("TRUNCATE TABLE vacancies, employers RESTART IDENTITY CASCADE")
+        cur.execute(
+            "TRUNCATE TABLE vacancy_skills, skills, vacancies, employers, employer_resolutions "
+            "RESTART IDENTITY CASCADE"
+        )
     db.conn.commit()
 
 
@@ -0,0 +1,72 @@
+import json
+from unittest.mock import Mock
+
+from backfill import backfill, find_files
+from src.batch_parser import BatchParser, VACANCY_FIELDS, parse_page, parse_page_with_employers
+
+
+def _page(ids):
+    return json.dumps({'items': [{
+        'id': vacancy_id,
+        'name': 'Python Developer',
+        'employer': {'id': '456', 'name': 'Test Company'},
+        'salary': None,
+        'alternate_url': 'http://test.com',
+        'snippet': {'requirement': 'Test requirements'},
+        'address': {'city': 'Moscow'}
+    } for vacancy_id in ids]}).encode()
+
+
+def test_parse_page():
+    records = parse_page(_page(['1', '2']))
+
+    assert len(records) == 2
+    record = dict(zip(VACANCY_FIELDS, records[0]))
+    assert record['id'] == '1'
+    assert record['city'] == 'Moscow'
+    assert record['salary_from'] is None
+
+
+def test_parse_pages_in_process_pool_keeps_order():
+    pages = [_page([str(i)]) for i in range(10)]
+
+    batches = list(BatchParser(processes=2, chunksize=3).parse_pages(pages))
+
+    assert [batch[0][0] for batch in batches] == [str(i) for i in range(10)]
+
+
+def test_parse_page_with_employers():
+    records, employers = parse_page_with_employers(_page(['1', '2']))
+
+    assert len(records) == 2
+    assert employers == [{'id': '456', 'name': 'Test Company', 'url': None, 'open_vacancies': None}]
+
+
+def test_parse_pages_reads_input_lazily():
+    consumed = []
+
+    def pages():
+        for i in range(100):
+            consumed.append(i)
+            yield _page([str(i)])
+
+    batches = BatchParser(processes=2, chunksize=3).parse_pages(pages())
+    next(batches)
+
+    # В работе не больше processes * chunksize * 2 страниц
+    assert len(consumed) <= 2 * 3 * 2 + 1
+
+
+def test_backfill_inserts_employers_before_vacancies(tmp_path):
+    path = tmp_path / 'page.json'
+    path.write_bytes(_page(['1', '2']))
+    db_manager = Mock()
+    db_manager.get_skill_names.return_value = ['Python']
+
+    stats = backfill(db_manager, find_files([str(tmp_path)]), BatchParser(processes=1))
+
+    assert stats == {'pages': 1, 'vacancies': 2}
+    assert [call[0] for call in db_manager.method_calls] == [
+        'get_skill_names', 'insert_stub_employers', 'insert_vacancies', 'add_vacancy_skills'
+    ]
+    db_manager.add_vacancy_skills.assert_called_once_with({'1': ['Python'], '2': ['Python']}, 'snippet')
@@ -0,0 +1,143 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.crawl_planner import CrawlPlanner, DATE_FORMAT
+
+AREAS = [{
+    'id': '113', 'name': 'Россия', 'areas': [
+        {'id': '1', 'name': 'Москва', 'areas': []},
+        {'id': '2', 'name': 'Санкт-Петербург', 'areas': []},
+    ]
+}]
+
+
+class FakeHeadHunterAPI:
+    """Поиск по заранее заданным вакансиям с учетом региона, дат и ограничения выдачи"""
+
+    def __init__(self, vacancies, limit, areas=AREAS):
+        self.vacancies = vacancies
+        self.limit = limit
+        self.areas = areas
+        self.parents = {child['id']: area['id'] for area in areas for child in area['areas']}
+        self.calls = 0
+
+    def get_areas_tree(self):
+        return self.areas
+
+    def search_vacancies(self, params, page=0, per_page=100):
+        self.calls += 1
+        found = [v for v in self.vacancies if self._matches(v, params)]
+        start = page * per_page
+        assert start + per_page <= self.limit
+        return {'found': len(found), 'items': found[start:start + per_page]}
+
+    def _matches(self, vacancy, params):
+        areas = params.get('area')
+        if areas:
+            areas = areas if isinstance(areas, list) else [areas]
+            if vacancy['area'] not in areas and self.parents.get(vacancy['area']) not in areas:
+                return False
+        # Даты разбираются в формате API HH, поэтому другой формат в параметрах приведет к ошибке
+        if 'date_from' in params and vacancy['published_at'] < datetime.strptime(params['date_from'], DATE_FORMAT):
+            return False
+        if 'date_to' in params and vacancy['published_at'] > datetime.strptime(params['date_to'], DATE_FORMAT):
+            return False
+        return True
+
+
+def _vacancies(area, count, start_id):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return [
+        {'id': str(start_id + i), 'area': area, 'published_at': now - timedelta(hours=i * 7)}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize('vacancies', [
+    _vacancies('1', 5, 0) + _vacancies('2', 3, 100),
+    # Часть вакансий привязана к самому региону, а не к городам
+    _vacancies('1', 5, 0) + _vacancies('2', 3, 100) + _vacancies('113', 3, 200),
+])
+def test_crawl_covers_all_vacancies(vacancies):
+    planner = CrawlPlanner(FakeHeadHunterAPI(vacancies, limit=4), max_workers=4, limit=4, per_page=2)
+
+    plan = planner.plan('1')
+    crawled = planner.crawl('1')
+
+    assert all(query['found'] <= 4 for query in plan)
+    assert sorted(v['id'] for v in crawled) == sorted(v['id'] for v in vacancies)
+    assert planner.truncated == []
+
+
+def test_plan_without_split_when_under_limit():
+    planner = CrawlPlanner(FakeHeadHunterAPI(_vacancies('1', 3, 0), limit=4), limit=4)
+
+    assert planner.plan('1', '1') == [{'params': {'employer_id': '1', 'area': '1'}, 'found': 3}]
+
+
+class FlakyHeadHunterAPI(FakeHeadHunterAPI):
+    """Поиск, в котором первый подсчет запроса без региона завышен, а одна страница всегда недоступна"""
+
+    def __init__(self, vacancies, limit, drift=0, broken_page=None):
+        super().__init__(vacancies, limit)
+        self.drift = drift
+        self.broken_page = broken_page
+        self.counted = set()
+
+    def search_vacancies(self, params, page=0, per_page=100):
+        if (params, page) == self.broken_page:
+            raise ConnectionError("Ошибка при запросе вакансий")
+        result = super().search_vacancies(params, page, per_page)
+        key = tuple(sorted(params.items()))
+        if per_page == 1 and 'area' not in params and key not in self.counted:
+            self.counted.add(key)
+            result['found'] += self.drift
+        return result
+
+
+def test_plan_keeps_area_split_on_count_drift():
+    vacancies = _vacancies('1', 5, 0) + _vacancies('2', 3, 100)
+    planner = CrawlPlanner(FlakyHeadHunterAPI(vacancies, limit=4, drift=1), limit=4, per_page=2)
+
+    plan = planner.plan('1')
+
+    # Москва делится по датам, так как в ней больше 4 вакансий, а регион целиком по датам не делится
+    assert {query['params'].get('area') for query in plan} == {'1', '2'}
+    assert [query['params'] for query in plan if query['params']['area'] == '2'] == [{'employer_id': '1', 'area': '2'}]
+
+
+def test_plan_groups_small_regions():
+    areas = [{'id': '113', 'name': 'Россия', 'areas': [
+        {'id': str(region), 'name': f'Регион {region}', 'areas': []} for region in range(1, 81)
+    ]}]
+    vacancies = [
+        {'id': str(i), 'area': str(i % 80 + 1), 'published_at': datetime(2025, 7, 1, tzinfo=timezone.utc)}
+        for i in range(2500)
+    ]
+    api = FakeHeadHunterAPI(vacancies, limit=2000, areas=areas)
+    planner = CrawlPlanner(api, limit=2000)
+
+    plan = planner.plan('1')
+    calls = api.calls
+    crawled = planner.crawl('1')
+
+    assert len(plan) == 2
+    assert all(query['found'] <= 2000 for query in plan)
+    assert sum(len(query['params']['area']) for query in plan) == 80
+    # Подсчеты: без региона, Россия и 80 регионов; затем страницы двух запросов по 100 вакансий
+    assert api.calls - calls == 82 + sum(math.ceil(query['found'] / 100) for query in plan)
+    assert api.calls - calls <= 82 + 26
+    assert len(crawled) == 2500
+
+
+def test_crawl_collects_failed_pages():
+    vacancies = _vacancies('1', 3, 0)
+    api = FlakyHeadHunterAPI(vacancies, limit=4, broken_page=({'employer_id': '1'}, 1))
+    planner = CrawlPlanner(api, limit=4, per_page=2)
+
+    crawled = planner.crawl('1')
+
+    assert len(crawled) == 2
+    assert [(failed['params'], failed['page']) for failed in planner.failed] == [({'employer_id': '1'}, 1)]
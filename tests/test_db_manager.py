@@ -1,3 +1,7 @@
+from src.batch_parser import VACANCY_FIELDS
+from src.db_creator import SCHEMA_VERSION
+
+
 def test_insert_employer(db_manager, sample_employer):
     db_manager.insert_employer(sample_employer)
 
@@ -53,3 +57,114 @@ def test_get_vacancies_with_keyword(db_manager, sample_employer, sample_vacancy)
 
     assert len(vacancies) == 1
     assert vacancies[0]['title'] == sample_vacancy['title']
+
+
+def test_pin_employer_is_not_overwritten(db_manager, sample_employer):
+    db_manager.insert_employer(sample_employer)
+    db_manager.pin_employer('Test', sample_employer['id'])
+    db_manager.save_employer_resolution('Test', '99999', ambiguous=True)
+
+    resolutions = db_manager.get_employer_resolutions(['Test'], ttl_days=7)
+
+    assert resolutions['Test']['employer_id'] == sample_employer['id']
+    assert resolutions['Test']['pinned'] is True
+    assert resolutions['Test']['stale'] is False
+
+
+def test_update_vacancy_details(db_manager, sample_employer, sample_vacancy):
+    db_manager.insert_employer(sample_employer)
+    db_manager.insert_vacancy(sample_vacancy)
+    assert db_manager.get_vacancies_for_enrichment(ttl_days=1) == {sample_vacancy['id']: None}
+
+    db_manager.update_vacancy_details([{
+        'id': sample_vacancy['id'],
+        'description': 'Full description',
+        'key_skills': [],
+        'experience': 'Нет опыта',
+        'employment': 'Полная занятость',
+        'detail_hash': 'abc'
+    }])
+
+    assert db_manager.get_vacancies_for_enrichment(ttl_days=1) == {}
+
+
+def test_removed_vacancy_leaves_enrichment_queue(db_manager, sample_employer, sample_vacancy):
+    db_manager.insert_employer(sample_employer)
+    db_manager.insert_vacancy(sample_vacancy)
+
+    db_manager.mark_vacancies_removed([sample_vacancy['id']])
+
+    assert db_manager.get_vacancies_for_enrichment(ttl_days=0) == {}
+
+
+def test_skills_index(db_manager, sample_employer, sample_vacancy):
+    db_manager.insert_employer(sample_employer)
+    db_manager.insert_vacancy(sample_vacancy)
+    db_manager.add_vacancy_skills({sample_vacancy['id']: ['Kafka', 'Python']}, 'key_skills')
+
+    top_skills = db_manager.get_top_skills(city=sample_vacancy['city'].upper())
+    vacancies = db_manager.get_vacancies_with_skills(['kafka', 'PYTHON'])
+
+    assert {skill['skill'] for skill in top_skills} == {'Kafka', 'Python'}
+    assert len(vacancies) == 1
+    assert vacancies[0]['salary_from'] == sample_vacancy['salary_from']
+    assert db_manager.get_vacancies_with_skills(['Kafka', 'Java']) == []
+
+
+def test_insert_vacancies(db_manager, sample_employer, sample_vacancy):
+    db_manager.insert_employer(sample_employer)
+    record = tuple(sample_vacancy.get(field) for field in VACANCY_FIELDS)
+
+    db_manager.insert_vacancies([record, record])
+
+    vacancies = db_manager.get_vacancies_by_city(sample_vacancy['city'])
+    assert len(vacancies) == 1
+
+
+def test_get_schema_version(db_manager):
+    assert db_manager.get_schema_version() == SCHEMA_VERSION
+
+
+def test_query_cache_invalidated_by_insert(db_manager, sample_employer, sample_vacancy):
+    db_manager.insert_employer(sample_employer)
+    assert db_manager.get_companies_and_vacancies_count()[0]['vacancies_count'] == 0
+    assert db_manager.get_companies_and_vacancies_count()[0]['vacancies_count'] == 0
+    assert db_manager.get_cache_stats()['hits'] == 1
+
+    db_manager.insert_vacancy(sample_vacancy)
+
+    assert db_manager.get_companies_and_vacancies_count()[0]['vacancies_count'] == 1
+
+
+def test_insert_stub_employers_keeps_existing(db_manager, sample_employer):
+    db_manager.insert_employer(sample_employer)
+
+    db_manager.insert_stub_employers([
+        {'id': sample_employer['id'], 'name': 'Stub', 'url': None, 'open_vacancies': None},
+        {'id': '999', 'name': 'New Company', 'url': None, 'open_vacancies': None}
+    ])
+
+    names = {employer['id']: employer['name'] for employer in db_manager.get_employers()}
+    assert names == {sample_employer['id']: sample_employer['name'], '999': 'New Company'}
+
+
+def test_generation_has_epoch(db_manager, sample_employer):
+    epoch, generation = db_manager.get_generation()
+
+    db_manager.insert_employer(sample_employer)
+
+    assert epoch
+    assert db_manager.get_generation() == (epoch, generation + 1)
+
+
+def test_iter_rows_streams_in_batches(db_manager, sample_employer, sample_vacancy):
+    db_manager.insert_employer(sample_employer)
+    db_manager.insert_vacancies([
+        tuple({**sample_vacancy, 'id': str(i)}.get(field) for field in VACANCY_FIELDS) for i in range(5)
+    ])
+
+    batches = list(db_manager.iter_rows('get_all_vacancies', batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert db_manager.conn.autocommit is True
+    assert list(db_manager.iter_rows('get_vacancies_with_skills', [])) == []
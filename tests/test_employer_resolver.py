@@ -0,0 +1,63 @@
+from unittest.mock import Mock
+
+from src.employer_resolver import EmployerResolver
+
+
+def _cached_row(employer_id, name, stale=False, ambiguous=False):
+    return {
+        'query': name,
+        'employer_id': employer_id,
+        'ambiguous': ambiguous,
+        'candidates': [],
+        'pinned': False,
+        'stale': stale,
+        'name': name,
+        'url': 'http://test.com',
+        'open_vacancies': 1
+    }
+
+
+def test_resolve_uses_cache_without_search():
+    hh_api = Mock()
+    hh_api.find_employers.return_value = []
+    db_manager = Mock()
+    db_manager.get_employer_resolutions.return_value = {'A': _cached_row('1', 'A'), 'B': _cached_row('2', 'B')}
+
+    employers = EmployerResolver(hh_api, db_manager).resolve(['A', 'B'])
+
+    assert [e['id'] for e in employers] == ['1', '2']
+    hh_api.find_employers.assert_called_once_with([], 5)
+    hh_api.find_employer.assert_not_called()
+
+
+def test_resolve_searches_missing_and_stale():
+    hh_api = Mock()
+    hh_api.find_employers.return_value = [
+        {'query': 'B', 'employer': {'id': '2', 'name': 'B', 'url': '', 'open_vacancies': 3},
+         'candidates': [], 'ambiguous': True, 'error': False},
+        {'query': 'C', 'employer': None, 'candidates': [], 'ambiguous': False, 'error': False},
+    ]
+    db_manager = Mock()
+    db_manager.get_employer_resolutions.return_value = {'B': _cached_row('2', 'B', stale=True)}
+
+    resolver = EmployerResolver(hh_api, db_manager)
+    employers = resolver.resolve(['B', 'C'])
+
+    hh_api.find_employers.assert_called_once_with(['B', 'C'], 5)
+    assert [e['id'] for e in employers] == ['2']
+    assert [r['query'] for r in resolver.ambiguous] == ['B']
+    assert db_manager.save_employer_resolution.call_count == 2
+
+
+def test_resolve_falls_back_to_stale_cache_on_error():
+    hh_api = Mock()
+    hh_api.find_employers.return_value = [
+        {'query': 'A', 'employer': None, 'candidates': [], 'ambiguous': False, 'error': True},
+    ]
+    db_manager = Mock()
+    db_manager.get_employer_resolutions.return_value = {'A': _cached_row('1', 'A', stale=True)}
+
+    employers = EmployerResolver(hh_api, db_manager).resolve(['A'])
+
+    assert [e['id'] for e in employers] == ['1']
+    db_manager.save_employer_resolution.assert_not_called()
@@ -1,7 +1,12 @@
+import re
+
 import pytest
+import requests
 from unittest.mock import patch, Mock
 from requests.exceptions import RequestException
 
+from src.crawl_planner import CrawlPlanner
+
 
 def test_connect_success(hh_api):
     with patch('requests.get') as mock_get:
@@ -55,4 +60,138 @@ def test_parse_vacancies(hh_api):
     assert len(parsed) == 1
     assert parsed[0]['title'] == 'Python Developer'
     assert parsed[0]['city'] == 'Moscow'
-    
\ No newline at end of file
+    
+
+def test_find_employer_exact_match(hh_api):
+    with patch('requests.get') as mock_get:
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            'items': [
+                {'id': '1', 'name': 'Test Company Group', 'alternate_url': 'http://a.com', 'open_vacancies': 50},
+                {'id': '2', 'name': 'test company', 'alternate_url': 'http://b.com', 'open_vacancies': 5}
+            ]
+        }
+        mock_get.return_value = mock_response
+
+        result = hh_api.find_employer('Test Company')
+        assert result['employer']['id'] == '2'
+        assert result['ambiguous'] is False
+        assert len(result['candidates']) == 2
+
+
+def test_find_employer_ambiguous(hh_api):
+    with patch('requests.get') as mock_get:
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            'items': [
+                {'id': '1', 'name': 'Test Company Group', 'alternate_url': 'http://a.com', 'open_vacancies': 50},
+                {'id': '2', 'name': 'Test Company Bank', 'alternate_url': 'http://b.com', 'open_vacancies': 5}
+            ]
+        }
+        mock_get.return_value = mock_response
+
+        result = hh_api.find_employer('Test Company')
+        assert result['employer']['id'] == '1'
+        assert result['ambiguous'] is True
+
+
+def test_find_employers_keeps_order(hh_api):
+    def fake_get(url, params=None, headers=None):
+        response = Mock()
+        response.json.return_value = {
+            'items': [{'id': params['text'], 'name': params['text'], 'alternate_url': '', 'open_vacancies': 1}]
+        } if params else {}
+        return response
+
+    with patch('requests.get', side_effect=fake_get):
+        results = hh_api.find_employers(['A', 'B', 'C'], max_workers=3)
+        assert [r['employer']['id'] for r in results] == ['A', 'B', 'C']
+
+
+def test_parse_vacancy_details(hh_api):
+    test_data = {
+        'id': '123',
+        'description': '<p>Опыт с <strong>Python</strong> &amp; SQL</p>',
+        'key_skills': [{'name': 'Python'}, {'name': 'SQL'}],
+        'experience': {'id': 'between1And3', 'name': 'От 1 года до 3 лет'},
+        'employment': {'id': 'full', 'name': 'Полная занятость'}
+    }
+
+    details = hh_api._parse_vacancy_details(test_data)
+    assert details['description'] == 'Опыт с Python & SQL'
+    assert details['key_skills'] == ['Python', 'SQL']
+    assert details['experience'] == 'От 1 года до 3 лет'
+    assert details['detail_hash'] == hh_api._parse_vacancy_details(test_data)['detail_hash']
+
+
+def test_search_vacancies(hh_api):
+    with patch('requests.get') as mock_get:
+        mock_response = Mock()
+        mock_response.json.return_value = {'found': 2500, 'items': [{'id': '1', 'name': 'Python Developer'}]}
+        mock_get.return_value = mock_response
+
+        result = hh_api.search_vacancies({'employer_id': '1', 'area': '113'}, page=3, per_page=50)
+
+        assert result['found'] == 2500
+        assert result['items'][0]['title'] == 'Python Developer'
+        params = mock_get.call_args.kwargs['params']
+        assert params['area'] == '113'
+        assert params['page'] == 3
+        assert params['per_page'] == 50
+
+
+def test_get_vacancy_details_removed(hh_api):
+    with patch('requests.get') as mock_get:
+        mock_get.return_value = Mock(status_code=404)
+
+        assert hh_api.get_vacancy_details('123') == {'id': '123', 'removed': True}
+
+        mock_get.side_effect = RequestException("Timeout")
+        assert hh_api.get_vacancy_details('123') is None
+
+
+def test_search_vacancies_retries_transient_errors(hh_api):
+    hh_api.REQUEST_BACKOFF = 0
+    hh_api._HeadHunterAPI__connected = True
+    ok = Mock(status_code=200)
+    ok.json.return_value = {'found': 1, 'items': []}
+    with patch('requests.get') as mock_get:
+        mock_get.side_effect = [requests.exceptions.ConnectionError("reset"), Mock(status_code=503, headers={}), ok]
+
+        assert hh_api.search_vacancies({'employer_id': '1'})['found'] == 1
+        assert mock_get.call_count == 3
+
+        mock_get.side_effect = requests.exceptions.Timeout("timeout")
+        with pytest.raises(ConnectionError):
+            hh_api.search_vacancies({'employer_id': '1'})
+
+
+def test_get_vacancy_details_retries_rate_limit(hh_api):
+    hh_api.REQUEST_BACKOFF = 0
+    ok = Mock(status_code=200)
+    ok.json.return_value = {'id': '123', 'name': 'Python Developer', 'description': '<p>Text</p>', 'key_skills': []}
+    with patch('requests.get') as mock_get:
+        mock_get.side_effect = [Mock(status_code=429, headers={'Retry-After': '0'}), ok]
+
+        details = hh_api.get_vacancy_details('123')
+
+        assert details['id'] == '123'
+        assert mock_get.call_count == 2
+
+
+def test_crawl_sends_dates_in_hh_format(hh_api):
+    hh_api._HeadHunterAPI__connected = True
+    hh_api._HeadHunterAPI__areas = []
+    with patch('requests.get') as mock_get:
+        response = Mock(status_code=200)
+        # Без дат найдено больше ограничения, поэтому запрос делится по периодам публикации
+        response.json.side_effect = lambda: {'found': 1 if 'date_to' in mock_get.call_args.kwargs['params'] else 3,
+                                             'items': []}
+        mock_get.return_value = response
+
+        CrawlPlanner(hh_api, max_workers=1, limit=2).plan('1')
+
+    sent = [call.kwargs['params'] for call in mock_get.call_args_list]
+    dates = [params[key] for params in sent for key in ('date_from', 'date_to') if key in params]
+    assert dates
+    assert all(re.fullmatch(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d[+-]\d{4}', date) for date in dates)
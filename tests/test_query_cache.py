@@ -0,0 +1,96 @@
+import os
+import pickle
+import stat
+
+import pytest
+
+from src.query_cache import QueryCache, cached_query
+
+
+class FakeManager:
+    def __init__(self, cache):
+        self.cache = cache
+        self.generation = 0
+        self.calls = 0
+
+    def get_generation(self):
+        return self.generation
+
+    @cached_query
+    def get_items(self, skills, limit=10):
+        self.calls += 1
+        return [{'skills': list(skills), 'limit': limit}]
+
+
+def test_cache_hit_and_generation_invalidation():
+    manager = FakeManager(QueryCache())
+
+    assert manager.get_items(['Python'], limit=5) == [{'skills': ['Python'], 'limit': 5}]
+    manager.get_items(['Python'], limit=5)
+    assert manager.calls == 1
+
+    manager.generation += 1
+    manager.get_items(['Python'], limit=5)
+    assert manager.calls == 2
+    assert manager.cache.stats()['hits'] == 1
+    assert manager.cache.stats()['misses'] == 2
+
+
+def test_cached_result_is_a_copy():
+    manager = FakeManager(QueryCache())
+
+    manager.get_items(['Python']).append('changed')
+
+    assert manager.get_items(['Python']) == [{'skills': ['Python'], 'limit': 10}]
+
+
+def test_lru_eviction_by_size():
+    cache = QueryCache(max_bytes=300)
+    cache.put('a', 0, 'a' * 100)
+    cache.put('b', 0, 'b' * 100)
+    cache.get('a', 0)
+    cache.put('c', 0, 'c' * 100)
+
+    assert cache.get('a', 0)[0] is True
+    assert cache.get('b', 0)[0] is False
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] <= 300
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'cache')
+    cache = QueryCache(path=path)
+    cache.put(('get_items', ()), 3, [1, 2, 3])
+    cache.save()
+
+    loaded = QueryCache(path=path)
+
+    assert loaded.get(('get_items', ()), 3) == (True, [1, 2, 3])
+    assert loaded.get(('get_items', ()), 4) == (False, None)
+
+
+@pytest.mark.parametrize('content', [
+    b'not a pickle',
+    pickle.dumps([1, 2, 3]),
+    pickle.dumps({'key': 'value'}),
+    pickle.dumps({'key': (0, 'not bytes')}),
+])
+def test_corrupted_file_is_removed(tmp_path, content):
+    path = tmp_path / 'cache'
+    path.write_bytes(content)
+
+    cache = QueryCache(path=str(path))
+
+    assert cache.stats()['entries'] == 0
+    assert not path.exists()
+
+
+def test_save_creates_private_directory(tmp_path):
+    path = tmp_path / 'cache_dir' / 'cache'
+    cache = QueryCache(path=str(path))
+    cache.put('key', ('epoch', 0), [1])
+    cache.save()
+
+    assert path.exists()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert QueryCache(path=str(path)).get('key', ('other epoch', 0)) == (False, None)
@@ -0,0 +1,122 @@
+import http.client
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+from psycopg2 import OperationalError
+
+from src.query_service import DBManagerPool, QueryService, create_server
+
+
+def _db_manager():
+    db_manager = Mock()
+    db_manager.conn.closed = 0
+    db_manager.get_generation.return_value = ('epoch', 1)
+    db_manager.get_companies_and_vacancies_count.return_value = [{'name': 'Test Company', 'vacancies_count': 1}]
+    db_manager.iter_rows.side_effect = lambda *args, batch_size: iter([[{'title': 'A'}], [{'title': 'B'}]])
+    return db_manager
+
+
+@pytest.fixture
+def service():
+    db_manager = _db_manager()
+    return QueryService(DBManagerPool(1, lambda: db_manager))
+
+
+def test_handle_json_and_cache(service):
+    status, body, stream = service.handle('/companies', {})
+    service.handle('/companies', {})
+
+    assert status == 200
+    assert stream is False
+    assert json.loads(body) == [{'name': 'Test Company', 'vacancies_count': 1}]
+    with service.pool.acquire() as db_manager:
+        assert db_manager.get_companies_and_vacancies_count.call_count == 1
+
+
+def test_handle_ndjson(service):
+    status, body, stream = service.handle('/vacancies', {'city': 'Москва'})
+
+    assert stream is True
+    assert [json.loads(line) for line in b''.join(body).splitlines()] == [{'title': 'A'}, {'title': 'B'}]
+    with service.pool.acquire() as db_manager:
+        db_manager.iter_rows.assert_called_once_with('get_vacancies_by_city', 'Москва', batch_size=1000)
+
+
+def test_large_stream_is_not_cached(service):
+    service.stream_cache_max_bytes = 20
+    for _ in range(2):
+        b''.join(service.handle('/vacancies', {})[1])
+
+    with service.pool.acquire() as db_manager:
+        assert db_manager.iter_rows.call_count == 2
+
+
+def test_cache_hit_does_not_take_pool_slot(service):
+    service.handle('/companies', {})
+
+    with service.pool.acquire():
+        # Единственное соединение пула занято, но ответ берется из кэша
+        assert service.handle('/companies', {})[0] == 200
+
+
+def test_pool_replaces_closed_manager():
+    broken = _db_manager()
+    fresh = _db_manager()
+    managers = iter([broken, fresh])
+    pool = DBManagerPool(1, lambda: next(managers))
+
+    with pytest.raises(OperationalError):
+        with pool.acquire():
+            broken.conn.closed = 1
+            raise OperationalError("server closed the connection unexpectedly")
+
+    with pool.acquire() as db_manager:
+        assert db_manager is fresh
+
+
+def test_handle_errors(service):
+    assert service.handle('/unknown', {})[0] == 404
+    assert service.handle('/skills/top', {'limit': 'x'})[0] == 400
+
+
+def test_server_streams_ndjson(service):
+    server = create_server(service, 'localhost', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection('localhost', server.server_address[1])
+        conn.request('GET', '/vacancies?city=%D0%9C%D0%BE%D1%81%D0%BA%D0%B2%D0%B0')
+        response = conn.getresponse()
+
+        assert response.status == 200
+        assert response.getheader('Content-Type').startswith('application/x-ndjson')
+        assert len(response.read().splitlines()) == 2
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_busy_pool_returns_service_unavailable():
+    db_manager = _db_manager()
+    service = QueryService(DBManagerPool(1, lambda: db_manager, timeout=0.01))
+
+    with service.pool.acquire():
+        assert service.handle('/companies', {})[0] == 503
+        assert service.handle('/vacancies', {})[0] == 503
+
+    assert service.handle('/companies', {})[0] == 200
+
+
+def test_streams_leave_a_free_connection():
+    db_manager = _db_manager()
+    service = QueryService(DBManagerPool(2, lambda: db_manager, timeout=0.01))
+
+    status, body, stream = service.handle('/vacancies', {})
+    assert service.handle('/vacancies/higher-salary', {})[0] == 503
+    assert service.handle('/companies', {})[0] == 200
+    body.close()
+
+    assert service.handle('/vacancies/higher-salary', {})[0] == 200
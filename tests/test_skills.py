@@ -0,0 +1,19 @@
+from src.skills import SkillExtractor
+
+
+def test_normalize():
+    assert SkillExtractor.normalize('  REST   API ') == 'rest api'
+    assert SkillExtractor.normalize('Node.js') == 'node.js'
+
+
+def test_extract_known_skills():
+    extractor = SkillExtractor(['Apache Kafka'])
+    text = 'Опыт с <highlighttext>Python</highlighttext>, C++ и Apache Kafka. Знание CI/CD.'
+
+    skills = extractor.extract(text)
+
+    assert skills == ['Python', 'C++', 'Kafka', 'CI/CD', 'Apache Kafka']
+
+
+def test_extract_ignores_unknown_words():
+    assert SkillExtractor().extract('Дружный коллектив и печеньки') == []
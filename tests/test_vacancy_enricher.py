@@ -0,0 +1,34 @@
+from unittest.mock import Mock
+
+from src.vacancy_enricher import VacancyEnricher
+
+
+def _details(vacancy_id, detail_hash):
+    return {
+        'id': vacancy_id,
+        'description': 'Test description',
+        'key_skills': ['Python'],
+        'experience': None,
+        'employment': None,
+        'detail_hash': detail_hash
+    }
+
+
+def test_run_updates_changed_and_skips_unchanged():
+    hh_api = Mock()
+    hh_api.get_vacancy_details.side_effect = lambda vacancy_id: {
+        '1': _details('1', 'new'),
+        '2': _details('2', 'same'),
+        '3': None,
+        '4': {'id': '4', 'removed': True}
+    }[vacancy_id]
+    db_manager = Mock()
+    db_manager.get_vacancies_for_enrichment.return_value = {'1': None, '2': 'same', '3': None, '4': None}
+
+    stats = VacancyEnricher(hh_api, db_manager, batch_size=2).run()
+
+    assert stats == {'updated': 1, 'unchanged': 1, 'removed': 1, 'failed': 1}
+    assert db_manager.update_vacancy_details.call_count == 2
+    db_manager.update_vacancy_details.assert_any_call([_details('1', 'new')])
+    db_manager.touch_vacancy_details.assert_any_call(['2'])
+    db_manager.mark_vacancies_removed.assert_any_call(['4'])